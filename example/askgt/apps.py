@@ -4,3 +4,6 @@ class AskgtConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'askgt'
     verbose_name = 'AskGT - Soru Cevap'
+    
+    def ready(self):
+        import askgt.signals
@@ -1,10 +1,26 @@
+from django.core.cache import cache
 from .models import Category
 
+CATEGORIES_CACHE_KEY = 'askgt_context_categories'
+CATEGORIES_CACHE_TIMEOUT = 3600
+
+def get_active_categories():
+    """Aktif kategoriler (paylaşılan cache, signals.py ile geçersiz kılınır)"""
+    return cache.get_or_set(
+        CATEGORIES_CACHE_KEY,
+        lambda: list(Category.objects.filter(is_active=True).order_by('order', 'name')),
+        CATEGORIES_CACHE_TIMEOUT
+    )
+
 def askgt_categories(request):
     """AskGT kategorilerini template context'e ekle"""
-    categories = Category.objects.filter(is_active=True).order_by('order', 'name')
+    # Aynı istekte birden fazla render için cache'e tekrar gitme
+    categories = getattr(request, '_askgt_categories', None)
+    if categories is None:
+        categories = get_active_categories()
+        request._askgt_categories = categories
     
     return {
         'askgt_categories': categories,
-        'askgt_categories_count': categories.count(),
+        'askgt_categories_count': len(categories),
     }
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from askgt.search import update_document_vectors, update_question_vectors
+
+class Command(BaseCommand):
+    help = 'Doküman ve soruların tam metin arama vektörlerini yeniden oluştur'
+
+    def handle(self, *args, **options):
+        documents = update_document_vectors()
+        questions = update_question_vectors()
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Arama index\'i güncellendi: {documents} doküman, {questions} soru')
+        )
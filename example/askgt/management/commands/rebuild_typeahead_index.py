@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from askgt.typeahead import TypeaheadIndex
+
+class Command(BaseCommand):
+    help = 'Doküman ve soru başlıkları için typeahead önek index\'ini yeniden oluştur'
+
+    def handle(self, *args, **options):
+        index = TypeaheadIndex.rebuild()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Typeahead index\'i oluşturuldu: {len(index.entries)} kayıt, {len(index.vocabulary)} token'
+            )
+        )
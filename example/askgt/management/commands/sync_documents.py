@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from askgt.services import DocumentSyncService
+from askgt.services import DocumentSyncOrchestrator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Sadece test et, veri kaydetme',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Eşzamanlı senkronize edilecek kaynak sayısı',
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -32,7 +37,7 @@ class Command(BaseCommand):
             self.stdout.write(f"Senkronizasyon başlatıldı: {start_time}")
         
         try:
-            sync_service = DocumentSyncService()
+            orchestrator = DocumentSyncOrchestrator(max_workers=options['workers'])
             
             if options['source']:
                 # Belirli kaynak
@@ -40,10 +45,8 @@ class Command(BaseCommand):
                 try:
                     source = APISource.objects.get(name=options['source'], is_active=True)
                     if not options['dry_run']:
-                        count = sync_service.sync_from_source(source)
-                        self.stdout.write(
-                            self.style.SUCCESS(f"✅ {source.name}: {count} doküman senkronize edildi")
-                        )
+                        metrics = orchestrator.run([source])
+                        self._write_metrics(metrics, options['verbose'])
                     else:
                         self.stdout.write(f"🔍 DRY RUN: {source.name} kaynağı test edilecek")
                         
@@ -55,20 +58,13 @@ class Command(BaseCommand):
             else:
                 # Tüm kaynaklar
                 if not options['dry_run']:
-                    results = sync_service.sync_all_sources()
+                    metrics = orchestrator.run()
                     
-                    total_synced = sum(results.values())
+                    total_synced = sum(result['created'] for result in metrics.values())
                     self.stdout.write(
                         self.style.SUCCESS(f"✅ Toplam {total_synced} doküman senkronize edildi")
                     )
-                    
-                    for source_name, count in results.items():
-                        if count > 0:
-                            self.stdout.write(f"  📄 {source_name}: {count} doküman")
-                        else:
-                            self.stdout.write(
-                                self.style.WARNING(f"  ⚠️ {source_name}: Senkronizasyon başarısız")
-                            )
+                    self._write_metrics(metrics, options['verbose'])
                 else:
                     self.stdout.write("🔍 DRY RUN: Tüm kaynaklar test edilecek")
             
@@ -84,3 +80,20 @@ class Command(BaseCommand):
                 self.style.ERROR(f"❌ Senkronizasyon hatası: {str(e)}")
             )
             logger.error(f"Document sync error: {str(e)}", exc_info=True)
+
+    def _write_metrics(self, metrics, verbose):
+        for source_name, result in metrics.items():
+            if result['status'] == 'success':
+                self.stdout.write(
+                    f"  📄 {source_name}: {result['created']} yeni / {result['items']} işlenen doküman"
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING(f"  ⚠️ {source_name}: Senkronizasyon başarısız ({result['attempts']} deneme)")
+                )
+            
+            if verbose:
+                self.stdout.write(
+                    f"     {result['items_per_second']} doküman/sn, {result['bytes'] / 1024:.1f} KB, "
+                    f"{result['requests']} istek, {result['errors']} hata, {result['duration']} sn"
+                )
@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.urls import reverse
 from django.utils.text import slugify
 from core.models import BaseModel
@@ -44,11 +46,15 @@ class Question(BaseModel):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium', verbose_name="Öncelik")
     view_count = models.PositiveIntegerField(default=0, verbose_name="Görüntülenme Sayısı")
     is_featured = models.BooleanField(default=False, verbose_name="Öne Çıkan")
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "Soru"
         verbose_name_plural = "Sorular"
         ordering = ['-is_featured', '-priority', '-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='question_search_gin'),
+        ]
 
     def __str__(self):
         return self.title
@@ -108,6 +114,9 @@ class Document(BaseModel):
     content_preview = models.TextField(blank=True, verbose_name="İçerik Önizlemesi", help_text="Arama için kullanılır")
     is_featured = models.BooleanField(default=False, verbose_name="Öne Çıkan")
     is_external = models.BooleanField(default=True, verbose_name="Harici Doküman")
+    search_vector = SearchVectorField(null=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False, verbose_name="İçerik Özeti",
+                                    help_text="Senkronizasyonda değişmeyen dokümanları atlamak için")
 
     class Meta:
         verbose_name = "Doküman"
@@ -117,6 +126,7 @@ class Document(BaseModel):
             models.Index(fields=['category', 'is_active']),
             models.Index(fields=['source_id']),
             models.Index(fields=['document_type']),
+            GinIndex(fields=['search_vector'], name='document_search_gin'),
         ]
 
     def __str__(self):
@@ -167,6 +177,8 @@ class APISource(BaseModel):
     sync_enabled = models.BooleanField(default=True, verbose_name="Senkronizasyon Aktif")
     sync_interval = models.PositiveIntegerField(default=60, verbose_name="Senkronizasyon Aralığı (dakika)")
     last_sync = models.DateTimeField(null=True, blank=True, verbose_name="Son Senkronizasyon")
+    sync_cursor = models.JSONField(default=dict, blank=True, verbose_name="Senkronizasyon İmleci",
+                                   help_text="Artımlı senkronizasyon için son değişiklik zamanı / delta link")
     
     # Mapping ayarları
     title_field = models.CharField(max_length=50, default='title', verbose_name="Başlık Alanı")
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from typing import Iterable, Optional
+from .models import Document, Question
+
+# ts_headline vurgu işaretleri; HTML'e template filtresinde güvenli şekilde çevrilir
+HIGHLIGHT_START = '⟦'
+HIGHLIGHT_STOP = '⟧'
+
+def search_config() -> str:
+    """PostgreSQL metin arama yapılandırması (Türkçe kök bulma)"""
+    return getattr(settings, 'ASKGT_SEARCH_CONFIG', 'turkish')
+
+def document_vector() -> SearchVector:
+    config = search_config()
+    return (
+        SearchVector('title', weight='A', config=config) +
+        SearchVector('tags', weight='B', config=config) +
+        SearchVector('summary', weight='C', config=config) +
+        SearchVector('content_preview', weight='D', config=config)
+    )
+
+def question_vector() -> SearchVector:
+    config = search_config()
+    return (
+        SearchVector('title', weight='A', config=config) +
+        SearchVector('tags', weight='B', config=config) +
+        SearchVector('question', weight='C', config=config) +
+        SearchVector('answer', weight='D', config=config)
+    )
+
+def update_document_vectors(document_ids: Optional[Iterable[int]] = None) -> int:
+    """Dokümanların search_vector alanını tek UPDATE ile güncelle"""
+    queryset = Document.objects.all()
+    if document_ids is not None:
+        queryset = queryset.filter(pk__in=list(document_ids))
+    return queryset.update(search_vector=document_vector())
+
+def update_question_vectors(question_ids: Optional[Iterable[int]] = None) -> int:
+    """Soruların search_vector alanını tek UPDATE ile güncelle"""
+    queryset = Question.objects.all()
+    if question_ids is not None:
+        queryset = queryset.filter(pk__in=list(question_ids))
+    return queryset.update(search_vector=question_vector())
+
+def _headline(expression, query: SearchQuery, max_words: int) -> SearchHeadline:
+    return SearchHeadline(
+        expression, query, config=search_config(),
+        start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+        max_words=max_words, min_words=max(5, max_words // 3),
+    )
+
+def build_query(text: str) -> SearchQuery:
+    # websearch: "tırnaklı ifade", -hariç, OR desteği
+    return SearchQuery(text, config=search_config(), search_type='websearch')
+
+def search_documents(queryset: QuerySet, text: str) -> QuerySet:
+    """GIN index üzerinden eşleşen dokümanlar, rank ve vurgulu başlık/özet ile"""
+    query = build_query(text)
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query),
+        title_headline=_headline('title', query, 30),
+        # get_display_summary ile aynı öncelik: özet, yoksa içerik önizlemesi
+        summary_headline=_headline(Coalesce(NullIf('summary', Value('')), 'content_preview'), query, 35),
+    )
+
+def search_questions(queryset: QuerySet, text: str) -> QuerySet:
+    """GIN index üzerinden eşleşen sorular, rank ve vurgulu başlık/soru ile"""
+    query = build_query(text)
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query),
+        title_headline=_headline('title', query, 30),
+        question_headline=_headline('question', query, 35),
+    )
+
+def render_highlight(text: str) -> str:
+    """Vurgu işaretlerini escape edilmiş metinde <mark> etiketine çevir"""
+    if not text:
+        return ''
+    return mark_safe(
+        escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+    )
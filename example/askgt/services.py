@@ -1,44 +1,106 @@
+import concurrent.futures
+import hashlib
 import requests
 import logging
+import time
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .models import Document, Category, APISource, DocumentAccess
-from typing import Dict, List, Optional
+from .context_processors import CATEGORIES_CACHE_KEY
+from .search import update_document_vectors
+from .typeahead import TypeaheadIndex
+from typing import Dict, Iterable, List, Optional
 import json
 
 logger = logging.getLogger(__name__)
 
+class TimeoutSession(requests.Session):
+    """
+    Her isteğe varsayılan zaman aşımı uygulayan session.
+    
+    requests, Session.timeout özniteliğini dikkate almaz; zaman aşımı
+    verilmeyen istek yanıt vermeyen bir kaynakta sonsuza kadar bekler.
+    Geçici hatalar (429/5xx, bağlantı) üstel bekleme ile tekrar denenir.
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, timeout: int, retries: int = 0, backoff: float = 0):
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+    
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
 class DocumentSyncService:
     """Doküman senkronizasyon servisi"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.timeout = 30
+    UPSERT_BATCH_SIZE = 500
+    
+    # Upsert'te güncellenen alanlar; içerik özeti bunlardan hesaplanır
+    SYNC_FIELDS = ('title', 'original_url', 'summary', 'author', 'last_modified',
+                   'source_type', 'content_preview')
+    
+    def __init__(self, timeout: int = None, retries: int = None, backoff: float = None):
+        self.session = TimeoutSession(
+            timeout or getattr(settings, 'ASKGT_SYNC_TIMEOUT', 30),
+            retries if retries is not None else getattr(settings, 'ASKGT_SYNC_RETRIES', 3),
+            backoff if backoff is not None else getattr(settings, 'ASKGT_SYNC_BACKOFF', 2),
+        )
+        self.session.hooks['response'].append(self._count_response)
+        self.changed_document_ids = set()
+        self._categories = None
+        
+        # Kaynak başına metrikler (orkestratör tarafından okunur)
+        self.items_processed = 0
+        self.bytes_received = 0
+        self.request_count = 0
+        self.errors = 0
+    
+    def _count_response(self, response, *args, **kwargs):
+        self.request_count += 1
+        self.bytes_received += len(response.content)
     
     def sync_all_sources(self) -> Dict[str, int]:
         """Tüm aktif API kaynaklarından doküman çek"""
-        results = {}
-        
-        for source in APISource.objects.filter(is_active=True, sync_enabled=True):
-            try:
-                count = self.sync_from_source(source)
-                results[source.name] = count
-                
-                # Son senkronizasyon tarihini güncelle
-                source.last_sync = timezone.now()
-                source.save(update_fields=['last_sync'])
-                
-                logger.info(f"Synced {count} documents from {source.name}")
-                
-            except Exception as e:
-                logger.error(f"Error syncing from {source.name}: {str(e)}")
-                results[source.name] = 0
-        
-        return results
+        metrics = DocumentSyncOrchestrator().run()
+        return {name: result['created'] for name, result in metrics.items()}
     
     def sync_from_source(self, source: APISource) -> int:
         """Belirli bir kaynaktan doküman çek"""
+        count = self._sync_source(source)
+        self.refresh_typeahead()
+        return count
+    
+    def refresh_typeahead(self):
+        """Senkronizasyonda değişen dokümanları typeahead kuyruğuna al"""
+        if not self.changed_document_ids:
+            return
+        try:
+            TypeaheadIndex.enqueue(document_ids=self.changed_document_ids)
+        except Exception as e:
+            logger.error(f"Typeahead kuyruğuna alınamadı: {str(e)}")
+        self.changed_document_ids = set()
+    
+    def _sync_source(self, source: APISource) -> int:
         if source.name.lower() == 'confluence':
             return self._sync_confluence(source)
         elif source.name.lower() == 'sharepoint':
@@ -48,33 +110,66 @@ class DocumentSyncService:
         else:
             return self._sync_generic_api(source)
     
+    def _save_cursor(self, source: APISource, cursor: Dict):
+        """Tüm sayfalar başarıyla işlendikten sonra high-water mark'ı kaydet"""
+        source.sync_cursor = cursor
+        source.save(update_fields=['sync_cursor'])
+    
+    def _process_items(self, items: List[Dict], parser, source: APISource) -> int:
+        self.items_processed += len(items)
+        return self._upsert_documents([parser(item, source) for item in items])
+    
     def _sync_confluence(self, source: APISource) -> int:
-        """Confluence API'den doküman çek"""
+        """Confluence API'den doküman çek (CQL lastmodified ile artımlı, _links.next ile sayfalı)"""
         headers = {
             'Authorization': f'Bearer {source.api_key}',
             'Content-Type': 'application/json'
         }
         
-        # Confluence REST API endpoint
-        url = f"{source.api_url}/rest/api/content"
+        cursor = dict(source.sync_cursor or {})
+        cql = 'type=page'
+        if cursor.get('last_modified'):
+            # CQL tarihleri Confluence sunucu/kullanıcı saat diliminde yorumlanır;
+            # saat farkı ve kaymaya karşı pay bırakılır, tekrar gelen değişmemiş
+            # sayfalar içerik özetiyle atlanır
+            since = self._parse_date(cursor['last_modified']).astimezone(
+                ZoneInfo(getattr(settings, 'ASKGT_CONFLUENCE_TIMEZONE', settings.TIME_ZONE))
+            ) - timedelta(minutes=getattr(settings, 'ASKGT_CONFLUENCE_CURSOR_MARGIN', 60))
+            cql += f' AND lastmodified >= "{since:%Y-%m-%d %H:%M}"'
+        cql += ' order by lastmodified asc'
+        
+        url = f"{source.api_url}/rest/api/content/search"
         params = {
+            'cql': cql,
             'expand': 'body.storage,space,version',
             'limit': 100,
-            'type': 'page'
         }
         
         try:
-            response = self.session.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
             documents_created = 0
+            high_water = self._parse_date(cursor.get('last_modified'))
             
-            for item in data.get('results', []):
-                doc_data = self._parse_confluence_item(item, source)
-                if self._create_or_update_document(doc_data, source):
-                    documents_created += 1
+            while url:
+                response = self.session.get(url, headers=headers, params=params)
+                response.raise_for_status()
+                data = response.json()
+                
+                items = data.get('results', [])
+                documents_created += self._process_items(items, self._parse_confluence_item, source)
+                
+                for item in items:
+                    modified = self._parse_date(item.get('version', {}).get('when'))
+                    if modified and (high_water is None or modified > high_water):
+                        high_water = modified
+                
+                links = data.get('_links', {})
+                next_link = links.get('next')
+                url = f"{links.get('base', source.api_url)}{next_link}" if next_link else None
+                params = None  # next linki tüm parametreleri içerir
             
+            if high_water:
+                cursor['last_modified'] = high_water.isoformat()
+            self._save_cursor(source, cursor)
             return documents_created
             
         except requests.RequestException as e:
@@ -82,31 +177,56 @@ class DocumentSyncService:
             raise
     
     def _sync_sharepoint(self, source: APISource) -> int:
-        """SharePoint API'den doküman çek"""
+        """SharePoint Graph API'den doküman çek (delta sorgusu, @odata.nextLink ile sayfalı)"""
         headers = {
             'Authorization': f'Bearer {source.api_key}',
             'Accept': 'application/json'
         }
         
-        # SharePoint Graph API endpoint
-        url = f"{source.api_url}/sites/root/lists/Documents/items"
-        params = {
+        cursor = dict(source.sync_cursor or {})
+        
+        # Önceki çalışmadan kalan deltaLink yalnızca değişenleri döndürür
+        url = cursor.get('delta_link') or f"{source.api_url}/sites/root/lists/Documents/items/delta"
+        params = None if cursor.get('delta_link') else {
             'expand': 'fields',
             '$top': 100
         }
         
         try:
-            response = self.session.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
             documents_created = 0
+            removed_ids = []
+            delta_link = None
+            
+            while url:
+                response = self.session.get(url, headers=headers, params=params)
+                if response.status_code == 410 and cursor.get('delta_link'):
+                    # Delta token süresi dolmuş: tam senkronizasyona dön
+                    logger.warning(f"SharePoint delta token expired for {source.name}, resyncing")
+                    self._save_cursor(source, {})
+                    return self._sync_sharepoint(source)
+                response.raise_for_status()
+                data = response.json()
+                
+                items = []
+                for item in data.get('value', []):
+                    if '@removed' in item:
+                        removed_ids.append(f"sharepoint_{item['id']}")
+                    else:
+                        items.append(item)
+                documents_created += self._process_items(items, self._parse_sharepoint_item, source)
+                
+                url = data.get('@odata.nextLink')
+                delta_link = data.get('@odata.deltaLink', delta_link)
+                params = None
             
-            for item in data.get('value', []):
-                doc_data = self._parse_sharepoint_item(item, source)
-                if self._create_or_update_document(doc_data, source):
-                    documents_created += 1
+            if removed_ids:
+                removed = Document.objects.filter(source_id__in=removed_ids, is_active=True)
+                self.changed_document_ids.update(removed.values_list('pk', flat=True))
+                removed.update(is_active=False)
             
+            if delta_link:
+                cursor['delta_link'] = delta_link
+            self._save_cursor(source, cursor)
             return documents_created
             
         except requests.RequestException as e:
@@ -114,7 +234,12 @@ class DocumentSyncService:
             raise
     
     def _sync_wiki(self, source: APISource) -> int:
-        """Wiki API'den doküman çek"""
+        """
+        Wiki API'den doküman çek.
+        
+        İlk çalışmada allpages apcontinue ile sayfalanır; sonraki çalışmalarda
+        yalnızca high-water mark'tan sonraki recentchanges işlenir.
+        """
         headers = {
             'User-Agent': 'MiddlewarePortal/1.0',
             'Authorization': f'Bearer {source.api_key}' if source.api_key else None
@@ -122,26 +247,60 @@ class DocumentSyncService:
         
         # MediaWiki API endpoint
         url = f"{source.api_url}/api.php"
-        params = {
-            'action': 'query',
-            'format': 'json',
-            'list': 'allpages',
-            'aplimit': 100,
-            'apnamespace': 0
-        }
+        cursor = dict(source.sync_cursor or {})
+        started_at = timezone.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        if cursor.get('last_modified'):
+            params = {
+                'action': 'query',
+                'format': 'json',
+                'list': 'recentchanges',
+                'rcstart': cursor['last_modified'],
+                'rcdir': 'newer',
+                'rcnamespace': 0,
+                'rctype': 'edit|new',
+                'rcprop': 'title|ids|timestamp',
+                'rclimit': 500,
+            }
+            result_key = 'recentchanges'
+        else:
+            params = {
+                'action': 'query',
+                'format': 'json',
+                'list': 'allpages',
+                'aplimit': 500,
+                'apnamespace': 0
+            }
+            result_key = 'allpages'
         
         try:
-            response = self.session.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
             documents_created = 0
+            high_water = cursor.get('last_modified') or started_at
+            seen_pages = set()
             
-            for item in data.get('query', {}).get('allpages', []):
-                doc_data = self._parse_wiki_item(item, source)
-                if self._create_or_update_document(doc_data, source):
-                    documents_created += 1
+            while True:
+                response = self.session.get(url, headers=headers, params=params)
+                response.raise_for_status()
+                data = response.json()
+                
+                items = []
+                for item in data.get('query', {}).get(result_key, []):
+                    # Aynı sayfanın birden fazla değişikliği tek kez işlenir
+                    if item['pageid'] in seen_pages:
+                        continue
+                    seen_pages.add(item['pageid'])
+                    items.append(item)
+                    if item.get('timestamp') and item['timestamp'] > high_water:
+                        high_water = item['timestamp']
+                documents_created += self._process_items(items, self._parse_wiki_item, source)
+                
+                # apcontinue / rccontinue
+                if 'continue' not in data:
+                    break
+                params = {**params, **data['continue']}
             
+            cursor['last_modified'] = high_water
+            self._save_cursor(source, cursor)
             return documents_created
             
         except requests.RequestException as e:
@@ -149,7 +308,7 @@ class DocumentSyncService:
             raise
     
     def _sync_generic_api(self, source: APISource) -> int:
-        """Genel API'den doküman çek"""
+        """Genel API'den doküman çek (yanıtta 'next' varsa sayfalar takip edilir)"""
         headers = {
             'Authorization': f'Bearer {source.api_key}' if source.api_key else None,
             'Content-Type': 'application/json'
@@ -161,19 +320,19 @@ class DocumentSyncService:
             auth = None
         
         try:
-            response = self.session.get(source.api_url, headers=headers, auth=auth)
-            response.raise_for_status()
-            
-            data = response.json()
+            url = source.api_url
             documents_created = 0
             
-            # API'den gelen veri formatına göre parse et
-            items = data if isinstance(data, list) else data.get('items', data.get('results', []))
-            
-            for item in items:
-                doc_data = self._parse_generic_item(item, source)
-                if self._create_or_update_document(doc_data, source):
-                    documents_created += 1
+            while url:
+                response = self.session.get(url, headers=headers, auth=auth)
+                response.raise_for_status()
+                data = response.json()
+                
+                # API'den gelen veri formatına göre parse et
+                items = data if isinstance(data, list) else data.get('items', data.get('results', []))
+                documents_created += self._process_items(items, self._parse_generic_item, source)
+                
+                url = data.get('next') if isinstance(data, dict) else None
             
             return documents_created
             
@@ -238,40 +397,116 @@ class DocumentSyncService:
             'content_preview': item.get('content', item.get('body', ''))[:500]
         }
     
-    def _create_or_update_document(self, doc_data: Dict, source: APISource) -> bool:
-        """Doküman oluştur veya güncelle"""
-        try:
-            # Kategori bul veya oluştur
-            category, created = Category.objects.get_or_create(
-                name=doc_data['category_name'],
-                defaults={
-                    'slug': self._slugify_category(doc_data['category_name']),
-                    'description': f"{doc_data['category_name']} kategorisi",
-                    'icon': 'ri-file-text-line'
-                }
-            )
-            
-            # Doküman oluştur veya güncelle
-            document, created = Document.objects.update_or_create(
-                source_id=doc_data['source_id'],
-                defaults={
-                    'title': doc_data['title'],
-                    'original_url': doc_data['original_url'],
-                    'summary': doc_data['summary'],
-                    'category': category,
-                    'author': doc_data['author'],
-                    'last_modified': doc_data['last_modified'],
-                    'source_type': doc_data['source_type'],
-                    'content_preview': doc_data['content_preview'],
-                    'is_active': True
-                }
-            )
+    def _get_categories(self, names: Iterable[str]) -> Dict[str, Category]:
+        """Kategorileri bir kez yükle, eksik olanları toplu oluştur"""
+        if self._categories is None:
+            self._categories = {category.name: category for category in Category.objects.all()}
+        
+        missing = {name for name in names if name not in self._categories}
+        if missing:
+            slugs = {name: self._slugify_category(name) for name in missing}
+            Category.objects.bulk_create([
+                Category(
+                    name=name,
+                    slug=slugs[name],
+                    description=f"{name} kategorisi",
+                    icon='ri-file-text-line'
+                )
+                for name in missing
+            ], ignore_conflicts=True)
             
-            return created
+            # ignore_conflicts pk döndürmez; slug ile yeniden oku
+            by_slug = {category.slug: category for category in Category.objects.filter(slug__in=slugs.values())}
+            for name, slug in slugs.items():
+                if slug in by_slug:
+                    self._categories[name] = by_slug[slug]
             
-        except Exception as e:
-            logger.error(f"Error creating/updating document {doc_data['source_id']}: {str(e)}")
-            return False
+            # bulk_create sinyal tetiklemez
+            cache.delete(CATEGORIES_CACHE_KEY)
+        
+        return self._categories
+    
+    def _content_hash(self, doc_data: Dict) -> str:
+        payload = {field: doc_data[field] for field in self.SYNC_FIELDS}
+        payload['category_name'] = doc_data['category_name']
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _upsert_documents(self, documents: List[Dict]) -> int:
+        """
+        Dokümanları parçalar halinde tek INSERT ... ON CONFLICT ile yaz.
+        
+        İçerik özeti aynı olan aktif dokümanlar atlanır. bulk_create sinyal
+        tetiklemediği için arama vektörleri burada güncellenir, değişen
+        dokümanlar typeahead için changed_document_ids'e eklenir.
+        """
+        # Aynı source_id bir sorguda iki kez güncellenemez; son gelen geçerli
+        documents = list({doc_data['source_id']: doc_data for doc_data in documents}.values())
+        if not documents:
+            return 0
+        
+        documents_created = 0
+        for start in range(0, len(documents), self.UPSERT_BATCH_SIZE):
+            batch = documents[start:start + self.UPSERT_BATCH_SIZE]
+            try:
+                with transaction.atomic():
+                    documents_created += self._upsert_batch(batch)
+            except Exception as e:
+                # Tek hatalı kayıt tüm parçayı düşürmesin: parçayı tek tek yeniden dene
+                logger.warning(f"Batch upsert of {len(batch)} documents failed, retrying one by one: {str(e)}")
+                documents_created += self._upsert_each(batch)
+        return documents_created
+    
+    def _upsert_each(self, batch: List[Dict]) -> int:
+        documents_created = 0
+        for doc_data in batch:
+            try:
+                with transaction.atomic():
+                    documents_created += self._upsert_batch([doc_data])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error creating/updating document {doc_data['source_id']}: {str(e)}")
+        return documents_created
+    
+    def _upsert_batch(self, batch: List[Dict]) -> int:
+        categories = self._get_categories({doc_data['category_name'] for doc_data in batch})
+        existing = {
+            source_id: (content_hash, is_active)
+            for source_id, content_hash, is_active in Document.objects.filter(
+                source_id__in=[doc_data['source_id'] for doc_data in batch]
+            ).values_list('source_id', 'content_hash', 'is_active')
+        }
+        
+        objects = []
+        for doc_data in batch:
+            content_hash = self._content_hash(doc_data)
+            if existing.get(doc_data['source_id']) == (content_hash, True):
+                continue
+            objects.append(Document(
+                source_id=doc_data['source_id'],
+                category=categories[doc_data['category_name']],
+                content_hash=content_hash,
+                is_active=True,
+                **{field: doc_data[field] for field in self.SYNC_FIELDS}
+            ))
+        
+        if not objects:
+            return 0
+        
+        Document.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['source_id'],
+            update_fields=[*self.SYNC_FIELDS, 'category', 'content_hash', 'is_active', 'sync_date', 'updated_at'],
+        )
+        
+        # update_conflicts Django 4.2'de pk döndürmez
+        changed_ids = list(Document.objects.filter(
+            source_id__in=[document.source_id for document in objects]
+        ).values_list('pk', flat=True))
+        update_document_vectors(changed_ids)
+        self.changed_document_ids.update(changed_ids)
+        
+        return sum(1 for document in objects if document.source_id not in existing)
     
     def _extract_text_from_html(self, html_content: str) -> str:
         """HTML'den metin çıkar"""
@@ -305,6 +540,131 @@ class DocumentSyncService:
         from django.utils.text import slugify
         return slugify(name)
 
+class DocumentSyncOrchestrator:
+    """
+    Kaynakları sınırlı bir thread havuzunda eşzamanlı senkronize eder.
+    
+    Her kaynak kendi DocumentSyncService örneğinde (ayrı session) çalışır;
+    istek başına zaman aşımı ve HTTP tekrarları session'da, kaynak
+    düzeyindeki tekrarlar üstel bekleme ile burada uygulanır. İmleç yalnızca
+    başarılı tam çalışmada kaydedildiği için tekrar güvenlidir.
+    """
+    
+    def __init__(self, max_workers: int = None, timeout: int = None,
+                 retries: int = None, source_retries: int = None, backoff: float = None):
+        self.max_workers = max_workers or getattr(settings, 'ASKGT_SYNC_WORKERS', 4)
+        self.timeout = timeout or getattr(settings, 'ASKGT_SYNC_TIMEOUT', 30)
+        self.retries = retries if retries is not None else getattr(settings, 'ASKGT_SYNC_RETRIES', 3)
+        self.source_retries = (source_retries if source_retries is not None
+                               else getattr(settings, 'ASKGT_SYNC_SOURCE_RETRIES', 1))
+        self.backoff = backoff if backoff is not None else getattr(settings, 'ASKGT_SYNC_BACKOFF', 2)
+        self.changed_document_ids = set()
+    
+    def run(self, sources: Iterable[APISource] = None) -> Dict[str, Dict]:
+        """Kaynakları paralel senkronize et, kaynak başına metrikleri döndür"""
+        if sources is None:
+            sources = APISource.objects.filter(is_active=True, sync_enabled=True)
+        sources = list(sources)
+        if not sources:
+            return {}
+        
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(sources)),
+            thread_name_prefix='askgt-sync',
+        ) as executor:
+            futures = {executor.submit(self._run_source, source): source for source in sources}
+            for future in concurrent.futures.as_completed(futures):
+                metrics, changed_ids = future.result()
+                results[futures[future].name] = metrics
+                self.changed_document_ids |= changed_ids
+        
+        self.refresh_typeahead()
+        return results
+    
+    def refresh_typeahead(self):
+        """Tüm kaynaklarda değişen dokümanları tek seferde typeahead kuyruğuna al"""
+        if not self.changed_document_ids:
+            return
+        try:
+            TypeaheadIndex.enqueue(document_ids=self.changed_document_ids)
+        except Exception as e:
+            logger.error(f"Typeahead kuyruğuna alınamadı: {str(e)}")
+        self.changed_document_ids = set()
+    
+    def _run_source(self, source: APISource):
+        """
+        Tek kaynağı tekrar deneyerek senkronize et (worker thread'inde çalışır).
+        
+        Sayaçlar son denemeyi yansıtır; hiçbir hata çağırana taşınmaz, böylece
+        tek bir kaynak tüm çalışmayı durduramaz.
+        """
+        metrics = {
+            'status': 'failed',
+            'created': 0,
+            'items': 0,
+            'bytes': 0,
+            'requests': 0,
+            'errors': 0,
+            'attempts': 0,
+            'duration': 0.0,
+            'items_per_second': 0.0,
+        }
+        changed_ids = set()
+        start = time.perf_counter()
+        
+        try:
+            for attempt in range(self.source_retries + 1):
+                metrics['attempts'] += 1
+                attempt_start = time.perf_counter()
+                service = DocumentSyncService(timeout=self.timeout, retries=self.retries, backoff=self.backoff)
+                created = 0
+                failed = False
+                try:
+                    created = service._sync_source(source)
+                except Exception as e:
+                    failed = True
+                    logger.warning(f"Sync attempt {attempt + 1} failed for {source.name}: {str(e)}")
+                finally:
+                    service.session.close()
+                    # Başarısız denemede yazılan dokümanlar da index'e işlenmeli
+                    changed_ids |= service.changed_document_ids
+                
+                attempt_duration = time.perf_counter() - attempt_start
+                metrics.update({
+                    'created': created,
+                    'items': service.items_processed,
+                    'bytes': service.bytes_received,
+                    'requests': service.request_count,
+                    'errors': service.errors + int(failed),
+                    'items_per_second': round(service.items_processed / attempt_duration, 1) if attempt_duration else 0.0,
+                })
+                
+                if not failed:
+                    metrics['status'] = 'success'
+                    source.last_sync = timezone.now()
+                    source.save(update_fields=['last_sync'])
+                    break
+                if attempt < self.source_retries:
+                    time.sleep(self.backoff * (2 ** attempt))
+        except Exception as e:
+            metrics['errors'] += 1
+            logger.error(f"Sync bookkeeping failed for {source.name}: {str(e)}")
+        finally:
+            # Worker thread'inin veritabanı bağlantısı açık kalmasın
+            connection.close()
+        
+        metrics['duration'] = round(time.perf_counter() - start, 2)
+        
+        log = logger.info if metrics['status'] == 'success' else logger.error
+        log(
+            f"Sync {metrics['status']} for {source.name} after {metrics['attempts']} attempt(s): "
+            f"{metrics['items']} items ({metrics['created']} new) in {metrics['duration']}s, "
+            f"{metrics['items_per_second']} items/s, {metrics['bytes']} bytes, "
+            f"{metrics['requests']} requests, {metrics['errors']} errors"
+        )
+        return metrics, changed_ids
+
 class DocumentAnalyticsService:
     """Doküman analitik servisi"""
     
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.core.cache import cache
+from .models import Category, Document, Question
+from .context_processors import CATEGORIES_CACHE_KEY
+from .search import update_document_vectors, update_question_vectors
+from .typeahead import TypeaheadIndex
+
+# Bu alanlar değişmediyse (ör. yalnızca view_count) index güncellenmez
+DOCUMENT_SEARCH_FIELDS = {'title', 'tags', 'summary', 'content_preview'}
+QUESTION_SEARCH_FIELDS = {'title', 'tags', 'question', 'answer'}
+
+# Typeahead kaydında görünen alanlar (view_count sıralama için rebuild'de tazelenir)
+DOCUMENT_TYPEAHEAD_FIELDS = DOCUMENT_SEARCH_FIELDS | {'category', 'document_type', 'is_active', 'is_featured'}
+QUESTION_TYPEAHEAD_FIELDS = {'title', 'tags', 'question', 'category', 'is_active', 'is_featured'}
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    """Kategori değiştiğinde context processor cache'ini temizle"""
+    cache.delete(CATEGORIES_CACHE_KEY)
+
+@receiver(post_save, sender=Document)
+def index_document(sender, instance, update_fields=None, **kwargs):
+    """Doküman kaydedildiğinde (ör. admin) arama vektörünü ve typeahead'i güncelle"""
+    if update_fields is None or DOCUMENT_TYPEAHEAD_FIELDS & set(update_fields):
+        TypeaheadIndex.enqueue(document_ids=[instance.pk])
+    if update_fields is not None and not DOCUMENT_SEARCH_FIELDS & set(update_fields):
+        return
+    update_document_vectors([instance.pk])
+
+@receiver(post_save, sender=Question)
+def index_question(sender, instance, update_fields=None, **kwargs):
+    """Soru kaydedildiğinde arama vektörünü ve typeahead'i güncelle"""
+    if update_fields is None or QUESTION_TYPEAHEAD_FIELDS & set(update_fields):
+        TypeaheadIndex.enqueue(question_ids=[instance.pk])
+    if update_fields is not None and not QUESTION_SEARCH_FIELDS & set(update_fields):
+        return
+    update_question_vectors([instance.pk])
+
+@receiver(post_delete, sender=Question)
+def unindex_question(sender, instance, **kwargs):
+    """Silinen soruyu typeahead index'inden çıkar"""
+    TypeaheadIndex.enqueue(question_ids=[instance.pk])
+
+@receiver(post_delete, sender=Document)
+def unindex_document(sender, instance, **kwargs):
+    """Silinen dokümanı typeahead index'inden çıkar"""
+    TypeaheadIndex.enqueue(document_ids=[instance.pk])
@@ -1,6 +1,6 @@
 from celery import shared_task
 from django.utils import timezone
-from .services import DocumentSyncService
+from .services import DocumentSyncService, DocumentSyncOrchestrator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,16 +9,18 @@ logger = logging.getLogger(__name__)
 def sync_documents_task(self):
     """Doküman senkronizasyon görevi"""
     try:
-        sync_service = DocumentSyncService()
-        results = sync_service.sync_all_sources()
+        metrics = DocumentSyncOrchestrator().run()
         
-        total_synced = sum(results.values())
-        logger.info(f"Document sync completed: {total_synced} documents synced")
+        total_synced = sum(result['created'] for result in metrics.values())
+        failed = [name for name, result in metrics.items() if result['status'] != 'success']
+        logger.info(f"Document sync completed: {total_synced} documents synced, {len(failed)} sources failed")
         
         return {
-            'status': 'success',
+            'status': 'success' if not failed else 'partial',
             'total_synced': total_synced,
-            'results': results,
+            'results': {name: result['created'] for name, result in metrics.items()},
+            'metrics': metrics,
+            'failed_sources': failed,
             'timestamp': timezone.now().isoformat()
         }
         
@@ -69,11 +71,12 @@ def cleanup_old_access_logs():
     """Eski erişim loglarını temizle"""
     try:
         from .models import DocumentAccess
+        from authentication.services import ChunkedDeleteService
         from datetime import timedelta
         
-        # 6 ay öncesinden eski logları sil
+        # 6 ay öncesinden eski logları batch'ler halinde sil
         cutoff_date = timezone.now() - timedelta(days=180)
-        deleted_count = DocumentAccess.objects.filter(accessed_at__lt=cutoff_date).delete()[0]
+        deleted_count = ChunkedDeleteService(DocumentAccess, 'accessed_at').delete_before(cutoff_date)['deleted']
         
         logger.info(f"Cleaned up {deleted_count} old access logs")
         
@@ -90,3 +93,28 @@ def cleanup_old_access_logs():
             'error': str(exc),
             'timestamp': timezone.now().isoformat()
         }
+
+@shared_task
+def apply_typeahead_updates():
+    """Kuyruktaki doküman/soru değişikliklerini typeahead index'ine uygula (debounce edilir)"""
+    from .typeahead import TypeaheadIndex
+    
+    applied = TypeaheadIndex.apply_pending()
+    return f"Typeahead index'ine işlenen kayıt sayısı: {applied}"
+
+@shared_task
+def rebuild_typeahead_index():
+    """Typeahead index'ini baştan oluştur (soğuk cache'te istek yerine arka planda)"""
+    from django.core.cache import cache
+    from .typeahead import TypeaheadIndex, LOCK_KEY, REBUILD_SCHEDULED_KEY
+    
+    if not cache.add(LOCK_KEY, 1, 120):
+        # Devam eden güncelleme index yoksa kendisi oluşturur
+        cache.delete(REBUILD_SCHEDULED_KEY)
+        return 'Typeahead index\'i zaten güncelleniyor'
+    
+    try:
+        index = TypeaheadIndex.rebuild()
+        return f"Typeahead index'i oluşturuldu: {len(index.entries)} kayıt"
+    finally:
+        cache.delete_many([LOCK_KEY, REBUILD_SCHEDULED_KEY])
@@ -0,0 +1,9 @@
+from django import template
+from askgt.search import render_highlight
+
+register = template.Library()
+
+@register.filter
+def highlight(text):
+    """Arama vurgularını güvenli <mark> etiketlerine çevir"""
+    return render_highlight(text)
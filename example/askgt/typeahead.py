@@ -0,0 +1,317 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from authentication.services import SequenceQueue
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from typing import Dict, Iterable, List, Optional
+from .models import Document, Question
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = 'askgt_typeahead_index'
+VERSION_KEY = 'askgt_typeahead_version'
+LOCK_KEY = 'askgt_typeahead_lock'
+REBUILD_SCHEDULED_KEY = 'askgt_typeahead_rebuild_scheduled'
+
+# Değişen kayıt kuyruğu (sıra numaralı kayıtlar, debounce edilmiş tek görev uygular)
+QUEUE_PREFIX = 'askgt_typeahead_queue'
+QUEUE_TTL = 86400
+SCHEDULED_KEY = f"{QUEUE_PREFIX}:scheduled"
+
+_queue = SequenceQueue(QUEUE_PREFIX, QUEUE_TTL)
+
+MIN_QUERY_LENGTH = 2
+MAX_CANDIDATES = 500  # Kısa önekler için aday sınırı (yanıt süresini sabit tutar)
+
+INTERNAL_FIELDS = ('tokens', 'normalized_title')
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+TURKISH_FOLD = str.maketrans({'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c'})
+
+_local = {'version': None, 'index': None}
+_local_lock = threading.Lock()
+
+def normalize(text: str) -> str:
+    """Türkçe büyük/küçük harf ve aksan farklarını yok say (İstanbul ~ istanbul ~ ıstanbul)"""
+    text = (text or '').replace('I', 'ı').replace('İ', 'i').lower().translate(TURKISH_FOLD)
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(text))
+
+def _document_entry(document: Document) -> Dict:
+    return {
+        'type': 'document',
+        'id': document.id,
+        'title': document.title,
+        'summary': document.get_display_summary()[:200],
+        'url': document.get_absolute_url(),
+        'category': {
+            'name': document.category.name,
+            'slug': document.category.slug,
+            'icon': document.category.icon,
+        },
+        'document_type': document.get_document_type_display(),
+        'view_count': document.view_count,
+        'is_featured': document.is_featured,
+        'tokens': sorted(set(tokenize(f"{document.title} {document.tags}"))),
+        'normalized_title': normalize(document.title),
+    }
+
+def _question_entry(question: Question) -> Dict:
+    return {
+        'type': 'question',
+        'id': question.id,
+        'title': question.title,
+        'summary': question.question[:200],
+        'url': question.get_absolute_url(),
+        'category': {
+            'name': question.category.name,
+            'slug': question.category.slug,
+            'icon': question.category.icon,
+        },
+        'view_count': question.view_count,
+        'is_featured': question.is_featured,
+        'tokens': sorted(set(tokenize(f"{question.title} {question.tags}"))),
+        'normalized_title': normalize(question.title),
+    }
+
+class TypeaheadIndex:
+    """
+    Doküman/soru başlık ve etiketleri üzerinde önek (prefix) index'i.
+
+    Index Redis'te tek bir blob olarak paylaşılır, her process kendi
+    belleğinde tutar ve yalnızca versiyon değiştiğinde yeniden yükler.
+    Sorgular bellekte sıralı token listesi üzerinde bisect ile çalışır.
+    Index henüz yoksa istek beklemez; oluşturma arka plan görevine verilir.
+
+    Kayıt değişiklikleri istek sırasında yalnızca kuyruğa yazılır (enqueue);
+    ASKGT_TYPEAHEAD_DEBOUNCE saniye içindeki tüm değişiklikler tek bir arka
+    plan görevinde tek index yazımıyla uygulanır.
+    """
+
+    def __init__(self, data: Dict = None):
+        data = data or {}
+        self.entries: Dict[str, Dict] = data.get('entries', {})
+        self.postings: Dict[str, List[str]] = data.get('postings', {})
+        self.vocabulary: List[str] = sorted(self.postings)
+
+    # ============ Kalıcılık ============
+
+    @classmethod
+    def load(cls) -> Optional['TypeaheadIndex']:
+        """
+        Process içi kopya; versiyon değiştiyse Redis'ten yeniden yükle.
+
+        Index Redis'te yoksa (soğuk cache) istek beklemez: yeniden oluşturma
+        görevi planlanır ve process'te kopya da yoksa None döner; çağıran tam
+        metin aramaya düşer.
+        """
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cls._schedule_rebuild()
+            return _local['index']
+
+        if _local['version'] != version:
+            with _local_lock:
+                if _local['version'] != version:
+                    data = cache.get(INDEX_KEY)
+                    if data is None:
+                        # Blob silinmiş: arka planda yeniden oluşturulur
+                        cache.delete(VERSION_KEY)
+                        cls._schedule_rebuild()
+                        return _local['index']
+                    _local['index'] = cls(data)
+                    _local['version'] = version
+        return _local['index']
+
+    @staticmethod
+    def _schedule_rebuild():
+        """Soğuk başlangıçta yeniden oluşturma görevini bir kez planla"""
+        if cache.add(REBUILD_SCHEDULED_KEY, 1, 300):
+            from .tasks import rebuild_typeahead_index
+            try:
+                rebuild_typeahead_index.delay()
+            except Exception as e:
+                cache.delete(REBUILD_SCHEDULED_KEY)
+                logger.error(f"Typeahead index oluşturma görevi planlanamadı: {str(e)}")
+
+    def save(self):
+        cache.set(INDEX_KEY, {'entries': self.entries, 'postings': self.postings}, None)
+        if not cache.add(VERSION_KEY, 1, None):
+            cache.incr(VERSION_KEY)
+
+    @classmethod
+    def rebuild(cls) -> 'TypeaheadIndex':
+        """Tüm aktif doküman ve sorulardan index'i baştan oluştur"""
+        index = cls()
+        for document in Document.objects.filter(is_active=True).select_related('category').iterator():
+            index._add(f"d:{document.id}", _document_entry(document))
+        for question in Question.objects.filter(is_active=True).select_related('category').iterator():
+            index._add(f"q:{question.id}", _question_entry(question))
+
+        index.vocabulary = sorted(index.postings)
+        index.save()
+        return index
+
+    @classmethod
+    def enqueue(cls, document_ids: Iterable[int] = (), question_ids: Iterable[int] = ()):
+        """Değişen kayıtları transaction commit edildikten sonra kuyruğa al"""
+        document_ids = list(document_ids)
+        question_ids = list(question_ids)
+        if not document_ids and not question_ids:
+            return
+        transaction.on_commit(lambda: cls._enqueue(document_ids, question_ids))
+
+    @classmethod
+    def _enqueue(cls, document_ids: List[int], question_ids: List[int]):
+        try:
+            _queue.push((document_ids, question_ids))
+            cls._schedule()
+        except Exception as e:
+            logger.error(f"Typeahead değişikliği kuyruğa alınamadı: {str(e)}")
+
+    @staticmethod
+    def _schedule():
+        """Debounce: bekleyen görev yoksa uygulama görevini gecikmeli planla"""
+        debounce = getattr(settings, 'ASKGT_TYPEAHEAD_DEBOUNCE', 5)
+        if cache.add(SCHEDULED_KEY, 1, debounce + 60):
+            from .tasks import apply_typeahead_updates
+            apply_typeahead_updates.apply_async(countdown=debounce)
+
+    @classmethod
+    def apply_pending(cls) -> int:
+        """Kuyruktaki değişiklikleri tek index güncellemesiyle uygula"""
+        # Bu noktadan sonra gelen değişiklikler yeni bir görev planlar
+        cache.delete(SCHEDULED_KEY)
+
+        end, entries = _queue.pending()
+        if _queue.latest() > end:
+            cls._schedule()
+
+        document_ids, question_ids = set(), set()
+        for entry_document_ids, entry_question_ids in entries:
+            document_ids.update(entry_document_ids)
+            question_ids.update(entry_question_ids)
+
+        if not cls.update(document_ids, question_ids):
+            # Kilit alınamadı: imleç ilerlemez, görev tekrar planlanır
+            cls._schedule()
+            return 0
+
+        _queue.ack(end)
+        return len(document_ids) + len(question_ids)
+
+    @classmethod
+    def update(cls, document_ids: Iterable[int] = (), question_ids: Iterable[int] = ()) -> bool:
+        """Değişen kayıtları index'e işle (silinen/pasif olanlar çıkarılır)"""
+        document_ids = list(document_ids)
+        question_ids = list(question_ids)
+        if not document_ids and not question_ids:
+            return True
+
+        deadline = time.monotonic() + 10
+        while not cache.add(LOCK_KEY, 1, 120):
+            if time.monotonic() >= deadline:
+                logger.warning("Typeahead index kilidi alınamadı, güncelleme ertelendi")
+                return False
+            time.sleep(0.1)
+
+        try:
+            data = cache.get(INDEX_KEY)
+            if data is None:
+                cls.rebuild()
+                return True
+            index = cls(data)
+
+            for document_id in document_ids:
+                index._remove(f"d:{document_id}")
+            for question_id in question_ids:
+                index._remove(f"q:{question_id}")
+
+            documents = Document.objects.filter(pk__in=document_ids, is_active=True).select_related('category')
+            for document in documents:
+                index._add(f"d:{document.id}", _document_entry(document))
+            questions = Question.objects.filter(pk__in=question_ids, is_active=True).select_related('category')
+            for question in questions:
+                index._add(f"q:{question.id}", _question_entry(question))
+
+            index.vocabulary = sorted(index.postings)
+            index.save()
+            return True
+        finally:
+            cache.delete(LOCK_KEY)
+
+    def _add(self, key: str, entry: Dict):
+        self.entries[key] = entry
+        for token in entry['tokens']:
+            self.postings.setdefault(token, []).append(key)
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for token in entry['tokens']:
+            keys = self.postings.get(token)
+            if keys is None:
+                continue
+            keys = [existing for existing in keys if existing != key]
+            if keys:
+                self.postings[token] = keys
+            else:
+                del self.postings[token]
+
+    # ============ Sorgu ============
+
+    def _prefix_matches(self, prefix: str) -> set:
+        """Öneki taşıyan tokenların kayıtları (en fazla MAX_CANDIDATES)"""
+        matches = set()
+        position = bisect.bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            matches.update(self.postings[self.vocabulary[position]])
+            if len(matches) >= MAX_CANDIDATES:
+                break
+            position += 1
+        return matches
+
+    def search(self, query: str, limit: int = 10, types: Iterable[str] = ('document',),
+               category_slug: Optional[str] = None) -> List[Dict]:
+        """Her sorgu kelimesi bir token önekiyle eşleşmeli; son kelime yazılmakta olan önek"""
+        terms = tokenize(query)
+        if not terms or len(''.join(terms)) < MIN_QUERY_LENGTH:
+            return []
+
+        # En seçici (en uzun) terimden başla
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            matches = self._prefix_matches(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        types = set(types)
+        results = []
+        for key in candidates:
+            entry = self.entries[key]
+            if entry['type'] not in types:
+                continue
+            if category_slug and entry['category']['slug'] != category_slug:
+                continue
+            results.append(entry)
+
+        # Tam başlık öneki, öne çıkanlar ve popülerlik
+        normalized_query = normalize(query).strip()
+        results.sort(key=lambda entry: (
+            not entry['normalized_title'].startswith(normalized_query),
+            not entry['is_featured'],
+            -entry['view_count'],
+        ))
+        return [
+            {field: value for field, value in entry.items() if field not in INTERNAL_FIELDS}
+            for entry in results[:limit]
+        ]
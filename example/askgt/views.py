@@ -10,6 +10,8 @@ from django.urls import reverse
 from .models import Question, Category, Document, DocumentAccess
 from .forms import QuestionForm, CategoryForm
 from .services import DocumentAnalyticsService
+from .search import search_documents, search_questions, render_highlight
+from .typeahead import TypeaheadIndex
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,12 +38,7 @@ class CategoryDocumentListView(LoginRequiredMixin, ListView):
         source_type = self.request.GET.get('source')
         
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(summary__icontains=search) |
-                Q(content_preview__icontains=search) |
-                Q(tags__icontains=search)
-            )
+            queryset = search_documents(queryset, search)
         
         if document_type:
             queryset = queryset.filter(document_type=document_type)
@@ -49,11 +46,15 @@ class CategoryDocumentListView(LoginRequiredMixin, ListView):
         if source_type:
             queryset = queryset.filter(source_type=source_type)
         
-        # Sıralama
-        order_by = self.request.GET.get('order_by', '-created_at')
-        if order_by in ['-created_at', '-view_count', 'title', '-last_modified']:
-            queryset = queryset.order_by(order_by)
+        # Sıralama (aramada varsayılan: alaka düzeyi)
+        order_by = self.request.GET.get('order_by', '-rank' if search else '-created_at')
+        if order_by not in ['-created_at', '-view_count', 'title', '-last_modified', '-rank'] or (
+            order_by == '-rank' and not search
+        ):
+            order_by = '-created_at'
         
+        if order_by == '-rank':
+            return queryset.order_by('-rank', '-is_featured')
         return queryset.order_by('-is_featured', order_by)
 
     def get_context_data(self, **kwargs):
@@ -109,11 +110,7 @@ class AllDocumentsListView(LoginRequiredMixin, ListView):
         # Arama
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(summary__icontains=search) |
-                Q(tags__icontains=search)
-            )
+            return search_documents(queryset, search).order_by('-rank', '-is_featured')
         
         return queryset.order_by('-is_featured', '-created_at')
 
@@ -142,12 +139,7 @@ def question_list(request):
     featured = request.GET.get('featured')
     
     if search:
-        questions = questions.filter(
-            Q(title__icontains=search) |
-            Q(question__icontains=search) |
-            Q(answer__icontains=search) |
-            Q(tags__icontains=search)
-        )
+        questions = search_questions(questions, search).order_by('-rank', '-is_featured')
     
     if category_id:
         questions = questions.filter(category_id=category_id)
@@ -213,23 +205,34 @@ def category_list(request):
 
 @login_required
 def document_search_api(request):
-    """Doküman arama API"""
+    """
+    Doküman arama API
+    
+    Varsayılan olarak her tuş vuruşunda çağrılan typeahead (önek index'i)
+    modunda çalışır; ?mode=full tam metin arama sonuçlarını döndürür.
+    """
     query = request.GET.get('q', '')
     category_slug = request.GET.get('category', '')
-    limit = int(request.GET.get('limit', 10))
+    limit = min(int(request.GET.get('limit', 10)), 50)
     
-    documents = Document.objects.filter(is_active=True)
+    # Index henüz oluşturulmadıysa (soğuk cache) tam metin aramaya düşülür
+    index = TypeaheadIndex.load() if query and request.GET.get('mode') != 'full' else None
+    if index is not None:
+        types = ['document', 'question'] if request.GET.get('include_questions') else ['document']
+        results = index.search(query, limit=limit, types=types, category_slug=category_slug or None)
+        return JsonResponse({
+            'results': results,
+            'total': len(results)
+        })
     
-    if query:
-        documents = documents.filter(
-            Q(title__icontains=query) |
-            Q(summary__icontains=query) |
-            Q(tags__icontains=query)
-        )
+    documents = Document.objects.filter(is_active=True)
     
     if category_slug:
         documents = documents.filter(category__slug=category_slug)
     
+    if query:
+        documents = search_documents(documents, query).order_by('-rank', '-is_featured')
+    
     documents = documents.select_related('category')[:limit]
     
     results = []
@@ -238,6 +241,8 @@ def document_search_api(request):
             'id': doc.id,
             'title': doc.title,
             'summary': doc.get_display_summary(),
+            'title_highlight': render_highlight(getattr(doc, 'title_headline', '')),
+            'summary_highlight': render_highlight(getattr(doc, 'summary_headline', '')),
             'url': doc.get_absolute_url(),
             'category': {
                 'name': doc.category.name,
@@ -1,11 +1,13 @@
 from django.core.management.base import BaseCommand
 from django.contrib.sessions.models import Session
 from django.utils import timezone
-from authentication.models import UserSession
+from authentication.models import UserSession, LoginAttempt
+from authentication.services import ChunkedDeleteService
+from askgt.models import DocumentAccess
 from datetime import timedelta
 
 class Command(BaseCommand):
-    help = 'Süresi dolmuş oturumları temizle'
+    help = 'Süresi dolmuş oturumları ve eski erişim loglarını batch halinde temizle'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -14,23 +16,65 @@ class Command(BaseCommand):
             default=7,
             help='Kaç gün önceki oturumları temizle (varsayılan: 7)',
         )
+        parser.add_argument(
+            '--login-attempt-days',
+            type=int,
+            help='Bu günden eski giriş denemelerini de temizle',
+        )
+        parser.add_argument(
+            '--document-access-days',
+            type=int,
+            help='Bu günden eski doküman erişim loglarını da temizle',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='DELETE başına satır sayısı (varsayılan: 5000)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Batch\'ler arası bekleme (saniye)',
+        )
 
     def handle(self, *args, **options):
-        days = options['days']
-        cutoff_date = timezone.now() - timedelta(days=days)
+        now = timezone.now()
         
-        # Django sessions
-        expired_sessions = Session.objects.filter(expire_date__lt=timezone.now())
-        session_count = expired_sessions.count()
-        expired_sessions.delete()
+        # (etiket, model, zaman alanı, cutoff)
+        targets = [
+            ('Django oturumu', Session, 'expire_date', now),
+            ('kullanıcı oturumu', UserSession, 'last_activity', now - timedelta(days=options['days'])),
+        ]
+        if options['login_attempt_days']:
+            targets.append((
+                'giriş denemesi', LoginAttempt, 'timestamp',
+                now - timedelta(days=options['login_attempt_days'])
+            ))
+        if options['document_access_days']:
+            targets.append((
+                'doküman erişimi', DocumentAccess, 'accessed_at',
+                now - timedelta(days=options['document_access_days'])
+            ))
         
-        # User sessions
-        old_user_sessions = UserSession.objects.filter(last_activity__lt=cutoff_date)
-        user_session_count = old_user_sessions.count()
-        old_user_sessions.delete()
+        summary = []
+        for label, model, time_field, cutoff in targets:
+            service = ChunkedDeleteService(
+                model, time_field, batch_size=options['batch_size'], pause=options['pause']
+            )
+            result = service.delete_before(cutoff, progress=self.report_progress)
+            summary.append(f"{result['deleted']} {label}")
+            
+            self.stdout.write(
+                f"{result['table']}: {result['deleted']} satır, {result['batches']} batch, "
+                f"{result['seconds']}s ({result['rows_per_second']} satır/s)"
+            )
         
+        self.stdout.write(self.style.SUCCESS(f'Temizlendi: {", ".join(summary)}'))
+
+    def report_progress(self, stats):
         self.stdout.write(
-            self.style.SUCCESS(
-                f'Temizlendi: {session_count} Django oturumu, {user_session_count} kullanıcı oturumu'
-            )
+            f"  {stats['table']}: batch {stats['batch']}, toplam {stats['deleted']} "
+            f"({stats['rows_per_second']} satır/s)"
         )
@@ -1,8 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User, Group
-from django_auth_ldap.backend import LDAPBackend
-from authentication.models import UserProfile
+from django.contrib.auth.models import Group
+from authentication.services import LDAPDirectory, LDIFDirectory, LDAPUserSyncService
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,21 @@ class Command(BaseCommand):
             type=str,
             help='Belirli bir kullanıcıyı senkronize et',
         )
+        parser.add_argument(
+            '--ldif',
+            type=str,
+            help='LDAP sunucusu yerine LDIF dosyasından oku (test için)',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            help='LDAP sayfa boyutu (varsayılan: LDAP_SYNC_PAGE_SIZE)',
+        )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Dizinde artık bulunmayan LDAP kullanıcılarını pasif yap',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
@@ -28,48 +43,43 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - Değişiklikler kaydedilmeyecek'))
         
-        backend = LDAPBackend()
-        
-        if username:
-            self.sync_single_user(backend, username, dry_run)
+        if options.get('ldif'):
+            directory = LDIFDirectory(options['ldif'])
         else:
-            self.sync_all_users(backend, dry_run)
-
-    def sync_single_user(self, backend, username, dry_run):
-        """Tek kullanıcıyı senkronize et"""
+            directory = LDAPDirectory(page_size=options.get('page_size'))
+        
+        self.create_default_groups(dry_run)
+        
+        started = time.monotonic()
+        service = LDAPUserSyncService(directory, dry_run=dry_run)
+        
         try:
-            # LDAP'dan kullanıcı bilgilerini al
-            ldap_user = backend.get_user_model().objects.filter(username=username).first()
-            
-            if not ldap_user:
-                self.stdout.write(
-                    self.style.ERROR(f'Kullanıcı bulunamadı: {username}')
-                )
-                return
-            
-            # Profil oluştur/güncelle
-            if not dry_run:
-                profile, created = UserProfile.objects.get_or_create(user=ldap_user)
-                profile.last_ldap_sync = timezone.now()
-                profile.save()
-            
-            action = "oluşturuldu" if created else "güncellendi"
-            self.stdout.write(
-                self.style.SUCCESS(f'Kullanıcı {action}: {username}')
+            stats = service.sync(
+                username=username,
+                deactivate_missing=options['deactivate_missing'],
+                progress=self.report_progress,
             )
-            
         except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f'Hata ({username}): {str(e)}')
-            )
-
-    def sync_all_users(self, backend, dry_run):
-        """Tüm LDAP kullanıcılarını senkronize et"""
-        # Bu implementasyon LDAP sunucunuza göre özelleştirilmelidir
+            logger.error(f"LDAP senkronizasyon hatası: {str(e)}")
+            self.stdout.write(self.style.ERROR(f'Hata: {str(e)}'))
+            return
+        
+        if username and not stats['seen']:
+            self.stdout.write(self.style.ERROR(f'Kullanıcı bulunamadı: {username}'))
+            return
+        
         self.stdout.write(
-            self.style.WARNING('Toplu senkronizasyon için LDAP konfigürasyonu gerekli')
+            self.style.SUCCESS(
+                f"Senkronizasyon tamamlandı ({time.monotonic() - started:.1f}s): "
+                f"{stats['seen']} kayıt, {stats['created']} oluşturuldu, {stats['updated']} güncellendi, "
+                f"{stats['profiles_created']} profil oluşturuldu, {stats['profiles_updated']} profil güncellendi, "
+                f"{stats['deactivated']} pasif yapıldı"
+            )
         )
 
+    def report_progress(self, stats):
+        self.stdout.write(f"  {stats['seen']} kayıt işlendi")
+
     def create_default_groups(self, dry_run):
         """Varsayılan grupları oluştur"""
         default_groups = ['Admins', 'Users', 'Operators']
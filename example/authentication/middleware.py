@@ -2,7 +2,7 @@ from django.contrib.auth import logout
 from django.contrib.sessions.models import Session
 from django.utils import timezone
 from django.conf import settings
-from .models import UserSession
+from .services import SessionActivityTracker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,47 +12,51 @@ class SessionTimeoutMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.activity_tracker = SessionActivityTracker()
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            self.process_session_timeout(request)
-            self.update_user_session(request)
+            if self.process_session_timeout(request):
+                self.update_user_session(request)
         
         response = self.get_response(request)
         return response
 
     def process_session_timeout(self, request):
-        """Oturum zaman aşımını kontrol et"""
+        """
+        Oturum zaman aşımını kontrol et.
+        
+        Son aktivite yalnızca SESSION_ACTIVITY_GRANULARITY saniyeden eskiyse
+        yeniden yazılır; aksi halde session (ve UserSession) kaydı değişmez.
+        Aktivite güncellendiyse True döner.
+        """
         session_timeout = getattr(settings, 'SESSION_COOKIE_AGE', 1800)
+        granularity = getattr(settings, 'SESSION_ACTIVITY_GRANULARITY', 60)
+        now = timezone.now()
         last_activity = request.session.get('last_activity')
         
         if last_activity:
-            last_activity = timezone.datetime.fromisoformat(last_activity)
-            if (timezone.now() - last_activity).seconds > session_timeout:
+            elapsed = (now - timezone.datetime.fromisoformat(last_activity)).total_seconds()
+            if elapsed > session_timeout:
                 logger.info(f"Session timeout for user: {request.user.username}")
                 logout(request)
-                return
+                return False
+            if elapsed < granularity:
+                return False
         
         # Son aktivite zamanını güncelle
-        request.session['last_activity'] = timezone.now().isoformat()
+        request.session['last_activity'] = now.isoformat()
+        return True
 
     def update_user_session(self, request):
-        """Kullanıcı oturum bilgilerini güncelle"""
+        """Kullanıcı oturum bilgilerini güncelle (Redis'e, toplu flush ile veritabanına)"""
         try:
-            user_session, created = UserSession.objects.get_or_create(
-                user=request.user,
-                session_key=request.session.session_key,
-                defaults={
-                    'ip_address': self.get_client_ip(request),
-                    'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500],
-                }
+            self.activity_tracker.record(
+                request.session.session_key,
+                request.user.pk,
+                self.get_client_ip(request),
+                request.META.get('HTTP_USER_AGENT', ''),
             )
-            
-            if not created:
-                user_session.last_activity = timezone.now()
-                user_session.ip_address = self.get_client_ip(request)
-                user_session.save(update_fields=['last_activity', 'ip_address'])
-                
         except Exception as e:
             logger.error(f"Error updating user session: {e}")
 
@@ -45,7 +45,8 @@ class UserSession(models.Model):
     ip_address = models.GenericIPAddressField(verbose_name="IP Adresi")
     user_agent = models.TextField(verbose_name="User Agent")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma")
-    last_activity = models.DateTimeField(auto_now=True, verbose_name="Son Aktivite")
+    # auto_now değil: değer SessionActivityTracker tarafından izlenen aktivite zamanıyla yazılır
+    last_activity = models.DateTimeField(default=timezone.now, verbose_name="Son Aktivite")
     is_active = models.BooleanField(default=True, verbose_name="Aktif")
     
     class Meta:
@@ -0,0 +1,510 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import UserSession, UserProfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SequenceQueue:
+    """
+    Redis üzerinde sıra numaralı kayıt kuyruğu.
+
+    push() sayacı artırıp kaydı yazar; pending() imleçten sonraki kesintisiz
+    kayıtları okur, ack() imleci ilerletip okunan kayıtları siler. Sayaç
+    artırılıp kayıt henüz yazılmamış olabileceğinden imleç ilk eksik kayıtta
+    durur; gap_grace saniye boyunca yazılmayan kayıt (ör. yazmadan önce çöken
+    istek) atlanır.
+    """
+
+    def __init__(self, prefix: str, ttl: int = 86400, gap_grace: int = 60):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.gap_grace = gap_grace
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def _entry_key(self, sequence: int) -> str:
+        return self._key(f"entry:{sequence}")
+
+    def push(self, value) -> int:
+        """Kaydı kuyruğun sonuna ekle, sıra numarasını döndür"""
+        cache.add(self._key('seq'), 0, None)
+        sequence = cache.incr(self._key('seq'))
+        cache.set(self._entry_key(sequence), value, self.ttl)
+        return sequence
+
+    def latest(self) -> int:
+        return cache.get(self._key('seq')) or 0
+
+    def pending(self) -> Tuple[int, List]:
+        """İmlecin ilerleyebileceği son sıra numarası ve o noktaya kadarki kayıtlar"""
+        cursor = cache.get(self._key('cursor')) or 0
+        latest = self.latest()
+        if latest <= cursor:
+            return cursor, []
+
+        keys = [self._entry_key(sequence) for sequence in range(cursor + 1, latest + 1)]
+        entries = cache.get_many(keys)
+        end = self._contiguous_end(cursor, latest, entries)
+        return end, [entries[key] for key in keys[:end - cursor] if key in entries]
+
+    def ack(self, end: int):
+        """İmleci end'e ilerlet ve işlenen kayıtları sil"""
+        cursor = cache.get(self._key('cursor')) or 0
+        if end <= cursor:
+            return
+        cache.set(self._key('cursor'), end, None)
+        cache.delete_many([self._entry_key(sequence) for sequence in range(cursor + 1, end + 1)])
+
+    def _contiguous_end(self, cursor: int, latest: int, entries: Dict) -> int:
+        for sequence in range(cursor + 1, latest + 1):
+            if self._entry_key(sequence) in entries:
+                continue
+
+            now = time.time()
+            gap = cache.get(self._key('gap'))
+            if not isinstance(gap, tuple) or gap[0] != sequence:
+                cache.set(self._key('gap'), (sequence, now), self.ttl)
+                return sequence - 1
+            if now - gap[1] < self.gap_grace:
+                return sequence - 1
+            logger.warning(f"{self.prefix} kuyruğunda {sequence} sıra numaralı kayıt yazılmadı, atlanıyor")
+        return latest
+
+class SessionActivityTracker:
+    """
+    Kullanıcı oturum aktivitesini istek sırasında yalnızca Redis'e yazar.
+
+    Her oturumun son aktivitesi tek bir anahtarda tutulur; oturum ilk kez
+    kuyruğa girdiğinde sıra numaralı bir kayıt eklenir. flush() periyodik
+    olarak kuyruğu okuyup UserSession satırlarını toplu günceller/oluşturur.
+    """
+
+    PREFIX = 'session_activity'
+    ENTRY_TTL = 86400
+    QUEUED_FLUSHES = 4  # kuyruk işareti bu kadar flush aralığı sonra düşer
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self.queue = SequenceQueue(self.PREFIX, self.ENTRY_TTL)
+        # Kaydı kaybolan (atlanan) oturum işareti kısa sürede düşer ve oturum yeniden kuyruğa girer
+        self.queued_ttl = getattr(settings, 'SESSION_ACTIVITY_FLUSH_INTERVAL', 30) * self.QUEUED_FLUSHES
+
+    def _data_key(self, session_key: str) -> str:
+        return f"{self.PREFIX}:data:{session_key}"
+
+    def _queued_key(self, session_key: str) -> str:
+        return f"{self.PREFIX}:queued:{session_key}"
+
+    def record(self, session_key: str, user_id: int, ip_address: str, user_agent: str):
+        """Oturum aktivitesini kaydet (veritabanına dokunmaz)"""
+        if not session_key:
+            return
+
+        cache.set(self._data_key(session_key), {
+            'user_id': user_id,
+            'ip_address': ip_address,
+            'user_agent': user_agent[:500],
+            'last_activity': time.time(),
+        }, self.ENTRY_TTL)
+
+        # Oturum zaten kuyruktaysa yalnızca veri güncellenir
+        if cache.add(self._queued_key(session_key), 1, self.queued_ttl):
+            self.queue.push(session_key)
+
+    def pending_activity(self, session_keys: List[str]) -> Dict[str, Dict]:
+        """Henüz yazılmamış aktiviteleri yalnızca cache'ten oku (görüntüleme için)"""
+        data_keys = {self._data_key(key): key for key in session_keys if key}
+        activities = {}
+        for data_key, activity in cache.get_many(list(data_keys)).items():
+            activities[data_keys[data_key]] = {
+                **activity,
+                'last_activity': datetime.fromtimestamp(activity['last_activity'], tz=dt_timezone.utc),
+            }
+        return activities
+
+    def discard(self, session_key: str):
+        """Çıkış yapan oturumun bekleyen aktivitesini at"""
+        cache.delete_many([self._data_key(session_key), self._queued_key(session_key)])
+
+    def flush(self) -> int:
+        """Kuyruktaki oturumları UserSession tablosuna toplu yaz"""
+        end, entries = self.queue.pending()
+        session_keys = list(dict.fromkeys(entries))
+
+        # Veri okunmadan önce kuyruk işaretleri silinir; bu arada gelen
+        # aktivite oturumu yeniden kuyruğa alır ve kaybolmaz
+        cache.delete_many([self._queued_key(key) for key in session_keys])
+        try:
+            written = self.write(session_keys)
+        except Exception as e:
+            # İmleç ilerletilmez, kayıtlar bir sonraki flush'ta tekrar denenir
+            logger.error(f"Oturum aktivitesi yazılamadı: {str(e)}")
+            return 0
+
+        self.queue.ack(end)
+        return written
+
+    def write(self, session_keys: List[str]) -> int:
+        """Verilen oturumların Redis'teki son aktivitesini veritabanına yaz"""
+        data_keys = {self._data_key(key): key for key in session_keys}
+        activities: Dict[str, Dict] = {
+            data_keys[key]: value for key, value in cache.get_many(list(data_keys)).items()
+        }
+        if not activities:
+            return 0
+
+        existing = {
+            session.session_key: session
+            for session in UserSession.objects.filter(session_key__in=list(activities))
+        }
+
+        to_update = []
+        to_create = []
+        for session_key, activity in activities.items():
+            last_activity = datetime.fromtimestamp(activity['last_activity'], tz=dt_timezone.utc)
+            session = existing.get(session_key)
+            if session is not None:
+                session.last_activity = last_activity
+                session.ip_address = activity['ip_address']
+                to_update.append(session)
+            else:
+                to_create.append(UserSession(
+                    user_id=activity['user_id'],
+                    session_key=session_key,
+                    ip_address=activity['ip_address'],
+                    user_agent=activity['user_agent'],
+                    last_activity=last_activity,
+                ))
+
+        if to_update:
+            UserSession.objects.bulk_update(to_update, ['last_activity', 'ip_address'], batch_size=self.BATCH_SIZE)
+        if to_create:
+            UserSession.objects.bulk_create(to_create, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+
+        return len(to_update) + len(to_create)
+
+class ChunkedDeleteService:
+    """
+    Büyük log/oturum tablolarını sınırlı boyutlu raw DELETE batch'leriyle temizler.
+
+    Her batch birincil anahtar sırasıyla (keyset) seçilir ve ayrı transaction'da
+    silinir; ORM delete() gibi satırlar Python'a yüklenmez. Signal ve cascade
+    çalışmaz, bu yüzden yalnızca bağımlı tablosu olmayan modellerde kullanılır.
+    """
+
+    def __init__(self, model, time_field: str, batch_size: int = 5000, pause: float = 0):
+        self.model = model
+        self.table = model._meta.db_table
+        self.pk_column = model._meta.pk.column
+        self.time_column = model._meta.get_field(time_field).column
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def _delete_batch(self, cutoff: datetime, after) -> Tuple[int, Optional[object]]:
+        after_clause = f'AND "{self.pk_column}" > %s' if after is not None else ''
+        params = [cutoff] + ([after] if after is not None else []) + [self.batch_size]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH batch AS ('
+                f'SELECT "{self.pk_column}" FROM "{self.table}" '
+                f'WHERE "{self.time_column}" < %s {after_clause} '
+                f'ORDER BY "{self.pk_column}" LIMIT %s'
+                f'), deleted AS ('
+                f'DELETE FROM "{self.table}" USING batch '
+                f'WHERE "{self.table}"."{self.pk_column}" = batch."{self.pk_column}" '
+                f'RETURNING "{self.table}"."{self.pk_column}"'
+                f') SELECT COUNT(*), MAX("{self.pk_column}") FROM deleted',
+                params
+            )
+            return cursor.fetchone()
+
+    def delete_before(self, cutoff: datetime, progress: Callable[[Dict], None] = None) -> Dict:
+        """cutoff'tan eski satırları sil; her batch sonrası progress(istatistik) çağrılır"""
+        started = time.monotonic()
+        deleted = 0
+        batches = 0
+        after = None
+
+        while True:
+            count, last_pk = self._delete_batch(cutoff, after)
+            if not count:
+                break
+
+            deleted += count
+            batches += 1
+            after = last_pk
+
+            if progress:
+                elapsed = time.monotonic() - started
+                progress({
+                    'table': self.table,
+                    'batch': batches,
+                    'deleted': deleted,
+                    'rows_per_second': round(deleted / elapsed, 1) if elapsed else deleted,
+                })
+
+            if count < self.batch_size:
+                break
+            if self.pause:
+                time.sleep(self.pause)
+
+        elapsed = time.monotonic() - started
+        return {
+            'table': self.table,
+            'deleted': deleted,
+            'batches': batches,
+            'seconds': round(elapsed, 2),
+            'rows_per_second': round(deleted / elapsed, 1) if elapsed else deleted,
+        }
+
+class LDAPDirectory:
+    """LDAP'tan kullanıcı kayıtlarını Simple Paged Results ile sayfa sayfa okur"""
+
+    def __init__(self, page_size: int = None):
+        self.uri = settings.LDAP_SERVER_URI
+        self.bind_dn = settings.LDAP_BIND_DN
+        self.bind_password = settings.LDAP_BIND_PASSWORD
+        self.search_base = settings.LDAP_USER_SEARCH_BASE
+        self.search_filter = getattr(settings, 'LDAP_USER_SEARCH_FILTER', '(objectClass=person)')
+        self.page_size = page_size or getattr(settings, 'LDAP_SYNC_PAGE_SIZE', 1000)
+
+    def search(self, username: str = None) -> Iterator[Tuple[str, Dict]]:
+        """(dn, attributes) kayıtlarını sayfalar halinde üret"""
+        import ldap
+        from ldap.controls import SimplePagedResultsControl
+        from ldap.filter import escape_filter_chars
+
+        search_filter = self.search_filter
+        if username:
+            username_attr = LDAPUserSyncService.attribute_map()['username']
+            search_filter = f"(&{search_filter}({username_attr}={escape_filter_chars(username)}))"
+
+        connection = ldap.initialize(self.uri)
+        connection.set_option(ldap.OPT_REFERRALS, 0)
+        connection.simple_bind_s(self.bind_dn, self.bind_password)
+
+        control = SimplePagedResultsControl(True, size=self.page_size, cookie='')
+        attributes = list(LDAPUserSyncService.attribute_map().values())
+
+        try:
+            while True:
+                message_id = connection.search_ext(
+                    self.search_base, ldap.SCOPE_SUBTREE, search_filter, attributes, serverctrls=[control]
+                )
+                _, results, _, server_controls = connection.result3(message_id)
+
+                for dn, entry in results:
+                    if dn:
+                        yield dn, entry
+
+                page_controls = [
+                    ctrl for ctrl in server_controls
+                    if ctrl.controlType == SimplePagedResultsControl.controlType
+                ]
+                if not page_controls or not page_controls[0].cookie:
+                    break
+                control.cookie = page_controls[0].cookie
+        finally:
+            connection.unbind_s()
+
+class LDIFDirectory:
+    """Test ortamı için LDAP yerine LDIF dosyasından kayıt okur"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def search(self, username: str = None) -> Iterator[Tuple[str, Dict]]:
+        from ldif import LDIFParser
+
+        username_attr = LDAPUserSyncService.attribute_map()['username']
+        records = []
+
+        class _Parser(LDIFParser):
+            def handle(self, dn, entry):
+                records.append((dn, entry))
+
+        with open(self.path, 'rb') as ldif_file:
+            _Parser(ldif_file).parse()
+
+        for dn, entry in records:
+            if username and LDAPUserSyncService.first_value(entry, username_attr) != username:
+                continue
+            yield dn, entry
+
+class LDAPUserSyncService:
+    """
+    Dizin kayıtlarını User/UserProfile ile toplu senkronize eder.
+
+    Kayıtlar CHUNK_SIZE'lık gruplar halinde işlenir: her grup için mevcut
+    kullanıcı ve profiller tek sorguyla yüklenir, farklar bellekte bulunur
+    ve bulk_create/bulk_update ile yazılır.
+    """
+
+    CHUNK_SIZE = 2000
+
+    USER_FIELDS = ['first_name', 'last_name', 'email']
+    PROFILE_FIELDS = ['department', 'phone', 'employee_id', 'ldap_dn']
+
+    DEFAULT_ATTRIBUTE_MAP = {
+        'username': 'uid',
+        'first_name': 'givenName',
+        'last_name': 'sn',
+        'email': 'mail',
+        'department': 'department',
+        'phone': 'telephoneNumber',
+        'employee_id': 'employeeNumber',
+    }
+
+    def __init__(self, directory, dry_run: bool = False):
+        self.directory = directory
+        self.dry_run = dry_run
+        self.stats = {'seen': 0, 'created': 0, 'updated': 0, 'profiles_created': 0, 'profiles_updated': 0, 'deactivated': 0}
+
+    @classmethod
+    def attribute_map(cls) -> Dict[str, str]:
+        return {**cls.DEFAULT_ATTRIBUTE_MAP, **getattr(settings, 'LDAP_USER_ATTR_MAP', {})}
+
+    @staticmethod
+    def first_value(entry: Dict, attribute: str) -> str:
+        values = entry.get(attribute) or []
+        if not values:
+            return ''
+        value = values[0]
+        return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+    def _normalize(self, dn: str, entry: Dict) -> Optional[Dict]:
+        """LDAP kaydını model alanlarına çevir (alan uzunluklarına göre kırp)"""
+        attribute_map = self.attribute_map()
+        record = {field: self.first_value(entry, attribute) for field, attribute in attribute_map.items()}
+        if not record['username']:
+            return None
+
+        record['username'] = record['username'][:150]
+        record['first_name'] = record['first_name'][:150]
+        record['last_name'] = record['last_name'][:150]
+        record['email'] = record['email'][:254]
+        record['department'] = record['department'][:100]
+        record['phone'] = record['phone'][:20]
+        record['employee_id'] = record['employee_id'][:50]
+        record['ldap_dn'] = dn[:500]
+        return record
+
+    def _chunks(self, username: str = None) -> Iterator[List[Dict]]:
+        chunk = []
+        for dn, entry in self.directory.search(username):
+            record = self._normalize(dn, entry)
+            if record is None:
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def sync(self, username: str = None, deactivate_missing: bool = False,
+             progress: Callable[[Dict], None] = None) -> Dict:
+        """Dizindeki kullanıcıları senkronize et"""
+        seen = set()
+
+        for chunk in self._chunks(username):
+            # Aynı grupta tekrar eden kullanıcılar için son kayıt geçerli
+            records = {record['username']: record for record in chunk}
+            seen.update(records)
+            self.stats['seen'] += len(records)
+
+            if self.dry_run:
+                existing = set(User.objects.filter(username__in=list(records)).values_list('username', flat=True))
+                self.stats['created'] += len(records) - len(existing)
+            else:
+                with transaction.atomic():
+                    self._apply_chunk(records)
+
+            if progress:
+                progress(dict(self.stats))
+
+        if deactivate_missing and not username:
+            self._deactivate_missing(seen)
+
+        return self.stats
+
+    def _apply_chunk(self, records: Dict[str, Dict]):
+        now = timezone.now()
+        users = {user.username: user for user in User.objects.filter(username__in=list(records))}
+
+        to_create = []
+        to_update = []
+        for username, record in records.items():
+            user = users.get(username)
+            if user is None:
+                user = User(username=username, is_active=True, **{field: record[field] for field in self.USER_FIELDS})
+                user.set_unusable_password()
+                to_create.append(user)
+            elif any(getattr(user, field) != record[field] for field in self.USER_FIELDS) or not user.is_active:
+                for field in self.USER_FIELDS:
+                    setattr(user, field, record[field])
+                user.is_active = True
+                to_update.append(user)
+
+        if to_create:
+            # PostgreSQL bulk_create birincil anahtarları doldurur
+            for user in User.objects.bulk_create(to_create, batch_size=self.CHUNK_SIZE):
+                users[user.username] = user
+        if to_update:
+            User.objects.bulk_update(to_update, self.USER_FIELDS + ['is_active'], batch_size=self.CHUNK_SIZE)
+
+        self.stats['created'] += len(to_create)
+        self.stats['updated'] += len(to_update)
+
+        user_ids = {username: users[username].pk for username in records}
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects.filter(user_id__in=list(user_ids.values()))
+        }
+
+        profiles_to_create = []
+        profiles_to_update = []
+        for username, record in records.items():
+            profile = profiles.get(user_ids[username])
+            if profile is None:
+                profiles_to_create.append(UserProfile(
+                    user_id=user_ids[username],
+                    last_ldap_sync=now,
+                    **{field: record[field] for field in self.PROFILE_FIELDS}
+                ))
+            elif any(getattr(profile, field) != record[field] for field in self.PROFILE_FIELDS):
+                for field in self.PROFILE_FIELDS:
+                    setattr(profile, field, record[field])
+                profiles_to_update.append(profile)
+
+        if profiles_to_create:
+            UserProfile.objects.bulk_create(profiles_to_create, batch_size=self.CHUNK_SIZE)
+        if profiles_to_update:
+            UserProfile.objects.bulk_update(profiles_to_update, self.PROFILE_FIELDS, batch_size=self.CHUNK_SIZE)
+        self.stats['profiles_created'] += len(profiles_to_create)
+        self.stats['profiles_updated'] += len(profiles_to_update)
+
+        # Senkronizasyon zamanı tüm grup için tek UPDATE ile yazılır
+        UserProfile.objects.filter(user_id__in=list(profiles)).update(last_ldap_sync=now)
+
+    def _deactivate_missing(self, seen: Iterable[str]):
+        """Dizinden kaldırılmış LDAP kullanıcılarını pasif yap"""
+        ldap_usernames = set(
+            User.objects.filter(is_active=True, profile__isnull=False).exclude(profile__ldap_dn='').values_list('username', flat=True)
+        )
+        missing = list(ldap_usernames - set(seen))
+        self.stats['deactivated'] = len(missing)
+
+        if self.dry_run:
+            return
+        for start in range(0, len(missing), self.CHUNK_SIZE):
+            User.objects.filter(username__in=missing[start:start + self.CHUNK_SIZE]).update(is_active=False)
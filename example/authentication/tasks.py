@@ -0,0 +1,16 @@
+from celery import shared_task
+from django.core.cache import cache
+from .services import SessionActivityTracker
+
+@shared_task
+def flush_session_activity():
+    """Redis'te biriken oturum aktivitelerini UserSession tablosuna yaz"""
+    lock_key = 'session_activity_flush_lock'
+    if not cache.add(lock_key, 1, 300):
+        return 'Flush zaten çalışıyor'
+    
+    try:
+        written = SessionActivityTracker().flush()
+        return f"Güncellenen oturum sayısı: {written}"
+    finally:
+        cache.delete(lock_key)
@@ -10,6 +10,7 @@ from django.conf import settings
 from axes.decorators import axes_dispatch
 from axes.helpers import is_locked
 from .models import LoginAttempt, UserSession, UserProfile
+from .services import SessionActivityTracker
 from .forms import CustomLoginForm
 import logging
 
@@ -87,6 +88,7 @@ def logout_view(request):
     username = request.user.username
     
     # Kullanıcı oturumunu pasif yap
+    SessionActivityTracker().discard(request.session.session_key)
     UserSession.objects.filter(
         user=request.user,
         session_key=request.session.session_key
@@ -102,10 +104,29 @@ def profile_view(request):
     profile, created = UserProfile.objects.get_or_create(user=request.user)
     
     # Aktif oturumlar
-    active_sessions = UserSession.objects.filter(
+    active_sessions = list(UserSession.objects.filter(
         user=request.user,
         is_active=True
-    ).order_by('-last_activity')
+    ).order_by('-last_activity'))
+    
+    # Henüz veritabanına yazılmamış aktivite cache'ten okunup gösterilir
+    current_key = request.session.session_key
+    pending = SessionActivityTracker().pending_activity(
+        [session.session_key for session in active_sessions] + [current_key]
+    )
+    for session in active_sessions:
+        if session.session_key in pending:
+            session.last_activity = max(session.last_activity, pending[session.session_key]['last_activity'])
+    if current_key in pending and all(session.session_key != current_key for session in active_sessions):
+        activity = pending[current_key]
+        active_sessions.append(UserSession(
+            user=request.user,
+            session_key=current_key,
+            ip_address=activity['ip_address'],
+            user_agent=activity['user_agent'],
+            last_activity=activity['last_activity'],
+        ))
+    active_sessions.sort(key=lambda session: session.last_activity, reverse=True)
     
     # Son giriş denemeleri
     recent_attempts = LoginAttempt.objects.filter(
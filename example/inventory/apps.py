@@ -4,3 +4,6 @@ class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inventory'
     verbose_name = 'Envanter'
+    
+    def ready(self):
+        import inventory.signals
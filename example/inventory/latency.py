@@ -0,0 +1,144 @@
+import math
+import time
+from django.core.cache import cache
+from typing import Dict, Iterable, List, Optional
+
+# Log-lineer kovalar: her kova bir öncekinden %5 geniş (HDR histogram'daki
+# gibi ~2 anlamlı basamak hassasiyet), 1ms altı tek kovada toplanır
+BUCKET_GROWTH = 1.05
+MAX_LATENCY_MS = 120000
+
+SLOT_SECONDS = 300  # 5 dakikalık dilimler
+RETENTION_SECONDS = 24 * 3600
+WINDOWS = {
+    '15m': 900,
+    '1h': 3600,
+    '24h': 86400,
+}
+PERCENTILES = (50, 95, 99)
+
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+def _key(application_id: int, slot: int) -> str:
+    return cache.make_key(f"inventory_latency:{application_id}:{slot}")
+
+def _client():
+    # Django cache API'sinde hash komutları yok; RedisCache istemcisi doğrudan kullanılır
+    return cache._cache.get_client(write=True)
+
+def bucket_index(value_ms: float) -> int:
+    if value_ms <= 1:
+        return 0
+    return int(math.log(min(value_ms, MAX_LATENCY_MS)) / _LOG_GROWTH) + 1
+
+def bucket_value(index: int) -> float:
+    """Kovanın temsil ettiği değer (kova sınırlarının geometrik ortası)"""
+    if index <= 0:
+        return 1.0
+    return BUCKET_GROWTH ** (index - 0.5)
+
+def _slot(now: float) -> int:
+    return int(now // SLOT_SECONDS) * SLOT_SECONDS
+
+def record_latency(application_id: int, value_ms: float, now: float = None):
+    """Tek uygulama için yanıt süresi örneği kaydet"""
+    record_latencies({application_id: value_ms}, now)
+
+def record_latencies(samples: Dict[int, float], now: float = None):
+    """
+    Örnekleri uygulama ve dilim başına bir Redis hash'ine HINCRBY ile ekle.
+
+    Artırım atomik olduğu için eşzamanlı yazan prober/health check'ler
+    birbirinin örneklerini ezmez; dilim anahtarı saklama süresi sonunda düşer.
+    """
+    samples = {app_id: value for app_id, value in samples.items() if value is not None}
+    if not samples:
+        return
+
+    slot = _slot(now or time.time())
+    pipeline = _client().pipeline(transaction=False)
+    for app_id, value in samples.items():
+        key = _key(app_id, slot)
+        pipeline.hincrby(key, bucket_index(value), 1)
+        pipeline.expire(key, RETENTION_SECONDS + SLOT_SECONDS)
+    pipeline.execute()
+
+def _load(application_ids: List[int], now: float) -> Dict[int, Dict]:
+    """Uygulamaların {dilim başlangıcı: {kova: adet}} histogramlarını tek turda oku"""
+    current = _slot(now)
+    slots = range(current - RETENTION_SECONDS + SLOT_SECONDS, current + SLOT_SECONDS, SLOT_SECONDS)
+    pipeline = _client().pipeline(transaction=False)
+    keys = []
+    for app_id in application_ids:
+        for slot in slots:
+            pipeline.hgetall(_key(app_id, slot))
+            keys.append((app_id, slot))
+
+    histograms = {app_id: {} for app_id in application_ids}
+    for (app_id, slot), buckets in zip(keys, pipeline.execute()):
+        if buckets:
+            histograms[app_id][slot] = {int(index): int(count) for index, count in buckets.items()}
+    return histograms
+
+def _merge(slots: Iterable[Dict[int, int]]) -> Dict[int, int]:
+    merged = {}
+    for buckets in slots:
+        for index, count in buckets.items():
+            merged[index] = merged.get(index, 0) + count
+    return merged
+
+def percentiles(buckets: Dict[int, int]) -> Dict[str, Optional[float]]:
+    """Kova sayımlarından p50/p95/p99 hesapla"""
+    total = sum(buckets.values())
+    result = {f"p{p}": None for p in PERCENTILES}
+    result['count'] = total
+    if not total:
+        return result
+
+    ordered = sorted(buckets.items())
+    for p in PERCENTILES:
+        rank = math.ceil(total * p / 100)
+        seen = 0
+        for index, count in ordered:
+            seen += count
+            if seen >= rank:
+                result[f"p{p}"] = round(bucket_value(index), 1)
+                break
+    return result
+
+def _summarize(histogram: Dict, now: float) -> Dict[str, Dict]:
+    return {
+        name: percentiles(_merge(
+            buckets for start, buckets in histogram.items() if start > now - seconds - SLOT_SECONDS
+        ))
+        for name, seconds in WINDOWS.items()
+    }
+
+def get_latency_summary(application_id: int, now: float = None) -> Dict[str, Dict]:
+    """15m/1h/24h kayan pencereler için yüzdelikler"""
+    now = now or time.time()
+    return _summarize(_load([application_id], now)[application_id], now)
+
+def get_latency_summaries(application_ids: List[int], now: float = None) -> Dict[int, Dict[str, Dict]]:
+    """Liste görünümleri için tek okuma turunda toplu özet"""
+    now = now or time.time()
+    histograms = _load(application_ids, now)
+    return {
+        app_id: _summarize(histograms[app_id], now)
+        for app_id in application_ids
+    }
+
+def get_latency_trend(application_id: int, bucket_seconds: int = 3600, now: float = None) -> List[Dict]:
+    """Son 24 saat için saatlik p50/p95/p99 trendi"""
+    now = now or time.time()
+    histogram = _load([application_id], now)[application_id]
+    end = int(now // bucket_seconds) * bucket_seconds + bucket_seconds
+
+    trend = []
+    for start in range(end - RETENTION_SECONDS, end, bucket_seconds):
+        point = percentiles(_merge(
+            buckets for slot, buckets in histogram.items() if start <= slot < start + bucket_seconds
+        ))
+        point['timestamp'] = start
+        trend.append(point)
+    return trend
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from inventory.services import backfill_application_versions
+
+class Command(BaseCommand):
+    help = 'Uygulama versiyonlarını parse ederek version_major/version_minor alanlarını doldur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='bulk_update başına kayıt sayısı (varsayılan: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_application_versions(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Güncellenen uygulama sayısı: {updated}'))
@@ -1,9 +1,24 @@
 from django.db import models
 from core.models import BaseModel
 from django.core.validators import MinValueValidator, MaxValueValidator
+import re
 import socket
+import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+VERSION_PATTERN = re.compile(r'(\d+)(?:\.(\d+))?')
+
+def parse_version(version):
+    """'EAP 8.0.1', '7.4', 'jboss8' gibi değerlerden (major, minor) çıkar"""
+    match = VERSION_PATTERN.search(version or '')
+    if not match:
+        return None, None
+    major = int(match.group(1))
+    minor = int(match.group(2)) if match.group(2) is not None else None
+    return major, minor
+
 class Server(BaseModel):
     """Sunucu modeli"""
     ENVIRONMENT_CHOICES = [
@@ -121,6 +136,8 @@ class Application(BaseModel):
     name = models.CharField(max_length=100, verbose_name="Uygulama Adı")
     application_type = models.CharField(max_length=20, choices=APPLICATION_TYPES, verbose_name="Uygulama Tipi")
     version = models.CharField(max_length=50, verbose_name="Versiyon")
+    version_major = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="Ana Versiyon")
+    version_minor = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="Alt Versiyon")
     server = models.ForeignKey(Server, on_delete=models.CASCADE, related_name='applications', verbose_name="Sunucu")
     port = models.PositiveIntegerField(verbose_name="Port")
     context_path = models.CharField(max_length=200, blank=True, verbose_name="Context Path")
@@ -163,10 +180,20 @@ class Application(BaseModel):
         verbose_name_plural = "Uygulamalar"
         ordering = ['name']
         unique_together = ['server', 'port']
+        indexes = [
+            models.Index(fields=['application_type', 'version_major', 'version_minor'], name='app_type_version_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.application_type}) - {self.server.hostname}"
 
+    def save(self, *args, **kwargs):
+        self.version_major, self.version_minor = parse_version(self.version)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'version' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'version_major', 'version_minor'}
+        super().save(*args, **kwargs)
+
     @property
     def full_url(self):
         """Uygulamanın tam URL'si"""
@@ -211,22 +238,23 @@ class Application(BaseModel):
     @property
     def is_jboss8(self):
         """JBoss 8 kontrolü"""
-        return (self.application_type == 'jboss' and 
-                ('8' in self.version or 'EAP 8' in self.version or 'jboss8' in self.version.lower()))
+        return self.application_type == 'jboss' and self.version_major == 8
     
     def check_status(self):
         """Uygulama durumunu kontrol et"""
         try:
             import requests
+            import time
             from datetime import datetime
+            from .latency import record_latency
             
             url = self.full_url
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             
             response = requests.get(url, timeout=10, verify=False)
-            end_time = datetime.now()
             
-            self.response_time = (end_time - start_time).total_seconds() * 1000
+            # Monotonik saat: sistem saati düzeltmelerinden etkilenmez
+            self.response_time = (time.perf_counter() - start_time) * 1000
             
             if response.status_code == 200:
                 self.status = 'running'
@@ -235,6 +263,12 @@ class Application(BaseModel):
                 
             self.last_check = datetime.now()
             self.save(update_fields=['status', 'response_time', 'last_check'])
+            
+            # Histogram yazılamazsa uygulama durumu etkilenmez
+            try:
+                record_latency(self.pk, self.response_time)
+            except Exception as e:
+                logger.error(f"Gecikme örneği kaydedilemedi ({self.name}): {str(e)}")
             return True
             
         except requests.exceptions.ConnectionError:
@@ -0,0 +1,408 @@
+import concurrent.futures
+import socket
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from typing import Dict, List, Optional, Tuple
+from .models import Server, Application, parse_version
+from .latency import record_latencies
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InventoryAggregatesService:
+    """
+    Envanter sayaçlarını tek bir koşullu aggregate sorgusuyla hesaplar.
+
+    Sonuçlar versiyonlu anahtarla cache'lenir; Server/Application değişince
+    (signals.py veya bulk_update sonrası) versiyon artırılarak geçersiz kılınır.
+    """
+
+    VERSION_KEY = 'inventory_aggregates_version'
+    CACHE_TIMEOUT = 600
+
+    @classmethod
+    def invalidate(cls):
+        if not cache.add(cls.VERSION_KEY, 1, None):
+            cache.incr(cls.VERSION_KEY)
+
+    @classmethod
+    def _cache_key(cls, name: str) -> str:
+        version = cache.get(cls.VERSION_KEY) or 0
+        return f"inventory_aggregates:{version}:{name}"
+
+    @staticmethod
+    def _jboss8_filter(prefix: str = '') -> Q:
+        return Q(**{
+            f'{prefix}is_active': True,
+            f'{prefix}application_type': 'jboss',
+            f'{prefix}version_major': 8,
+        })
+
+    @classmethod
+    def get_summary(cls) -> Dict:
+        """Dashboard, liste ve API için tüm envanter sayaçları"""
+        return cache.get_or_set(cls._cache_key('summary'), cls._compute_summary, cls.CACHE_TIMEOUT)
+
+    @classmethod
+    def _compute_summary(cls) -> Dict:
+        active = Q(applications__is_active=True)
+        aggregates = {
+            'total_servers': Count('id', filter=Q(is_active=True), distinct=True),
+            'total_applications': Count('applications', filter=active),
+            'running_applications': Count('applications', filter=active & Q(applications__status='running')),
+            'error_applications': Count('applications', filter=active & Q(applications__status='error')),
+            'jboss8_applications': Count('applications', filter=cls._jboss8_filter('applications__')),
+            'total_jboss_applications': Count(
+                'applications', filter=active & Q(applications__application_type='jboss')
+            ),
+        }
+        for environment, _ in Server.ENVIRONMENT_CHOICES:
+            aggregates[f'env_{environment}'] = Count('applications', filter=active & Q(environment=environment))
+        for app_type, _ in Application.APPLICATION_TYPES:
+            aggregates[f'type_{app_type}'] = Count(
+                'applications', filter=active & Q(applications__application_type=app_type)
+            )
+
+        # Server LEFT JOIN Application üzerinde tek sorgu
+        result = Server.objects.aggregate(**aggregates)
+
+        stats = {
+            key: result[key] for key in (
+                'total_applications', 'total_servers', 'running_applications',
+                'error_applications', 'jboss8_applications', 'total_jboss_applications',
+            )
+        }
+        if stats['total_jboss_applications'] > 0:
+            stats['jboss8_percentage'] = round(
+                (stats['jboss8_applications'] / stats['total_jboss_applications']) * 100, 1
+            )
+        else:
+            stats['jboss8_percentage'] = 0
+
+        # values().annotate() gruplamalarıyla aynı şekil (boş gruplar hariç)
+        stats['environment_stats'] = [
+            {'server__environment': environment, 'count': result[f'env_{environment}']}
+            for environment in sorted(choice for choice, _ in Server.ENVIRONMENT_CHOICES)
+            if result[f'env_{environment}']
+        ]
+        stats['type_stats'] = [
+            {'application_type': app_type, 'count': result[f'type_{app_type}']}
+            for app_type in sorted(choice for choice, _ in Application.APPLICATION_TYPES)
+            if result[f'type_{app_type}']
+        ]
+        return stats
+
+    @classmethod
+    def get_server_stats(cls, server: Server) -> Dict:
+        """Sunucudaki aktif uygulamaların durum dağılımı"""
+        return cache.get_or_set(
+            cls._cache_key(f'server_{server.pk}'),
+            lambda: server.applications.filter(is_active=True).aggregate(
+                total=Count('id'),
+                running=Count('id', filter=Q(status='running')),
+                stopped=Count('id', filter=Q(status='stopped')),
+                error=Count('id', filter=Q(status='error')),
+            ),
+            cls.CACHE_TIMEOUT
+        )
+
+def backfill_application_versions(batch_size: int = 1000) -> int:
+    """version_major/version_minor alanlarını mevcut kayıtlar için toplu doldur"""
+    pending = []
+    updated = 0
+
+    queryset = Application.objects.only('id', 'version', 'version_major', 'version_minor').order_by('pk')
+    for application in queryset.iterator(chunk_size=batch_size):
+        major, minor = parse_version(application.version)
+        if (major, minor) == (application.version_major, application.version_minor):
+            continue
+        application.version_major, application.version_minor = major, minor
+        pending.append(application)
+
+        if len(pending) >= batch_size:
+            Application.objects.bulk_update(pending, ['version_major', 'version_minor'])
+            updated += len(pending)
+            pending = []
+
+    if pending:
+        Application.objects.bulk_update(pending, ['version_major', 'version_minor'])
+        updated += len(pending)
+
+    if updated:
+        InventoryAggregatesService.invalidate()
+    return updated
+
+class HealthCheckService:
+    """Uygulamaları eşzamanlı kontrol eden, host başına bağlantı havuzu kullanan servis"""
+
+    def __init__(self, timeout: int = None, max_workers: int = None):
+        self.timeout = timeout or getattr(settings, 'INVENTORY_HEALTH_CHECK_TIMEOUT', 10)
+        self.max_workers = max_workers or getattr(settings, 'INVENTORY_HEALTH_CHECK_WORKERS', 32)
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def _get_session(self, host: str) -> requests.Session:
+        """Host başına tekrar kullanılan session (keep-alive)"""
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.verify = False
+                self._sessions[host] = session
+            return session
+
+    def close(self):
+        """Açık session'ları kapat"""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+    def probe(self, application: Application) -> Tuple[str, Optional[float]]:
+        """Tek uygulamayı kontrol et: (durum, yanıt süresi ms)"""
+        session = self._get_session(application.server.hostname)
+        start = time.perf_counter()
+
+        try:
+            response = session.get(application.full_url, timeout=self.timeout)
+            response_time = (time.perf_counter() - start) * 1000
+            return ('running' if response.status_code == 200 else 'error'), response_time
+        except requests.exceptions.ConnectionError:
+            return 'stopped', None
+        except Exception as e:
+            logger.debug(f"Health check hatası ({application.name}): {str(e)}")
+            return 'unknown', None
+
+    def check_applications(self, applications: List[Application]) -> List[Application]:
+        """Uygulamaları paralel kontrol et ve sonuçları tek bulk_update ile yaz"""
+        applications = list(applications)
+        if not applications:
+            return []
+
+        results: Dict[int, Tuple[str, Optional[float]]] = {}
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(applications))
+        )
+
+        try:
+            futures = {executor.submit(self.probe, app): app for app in applications}
+            # Tüm kontroller tek bir zaman aşımı penceresi içinde biter
+            done, _ = concurrent.futures.wait(futures, timeout=self.timeout + 2)
+            for future in done:
+                results[futures[future].pk] = future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.close()
+
+        now = timezone.now()
+        for app in applications:
+            status, response_time = results.get(app.pk, ('unknown', None))
+            app.status = status
+            if response_time is not None:
+                app.response_time = response_time
+            app.last_check = now
+
+        Application.objects.bulk_update(applications, ['status', 'response_time', 'last_check'])
+        InventoryAggregatesService.invalidate()
+        record_latencies({app_pk: result[1] for app_pk, result in results.items()})
+        return applications
+
+class FleetProber:
+    """
+    Tüm aktif sunucu (TCP/22) ve uygulamaları (HTTP) arka planda tarayan prober.
+
+    Hedef başına durum Redis'te tek bir kompakt tabloda tutulur:
+    key -> [durum, son kontrol, sonraki kontrol, aralık, son değişim zamanları].
+    Sağlıklı hedeflerin aralığı kademeli olarak uzar, hatalı veya sık durum
+    değiştiren (flapping) hedefler kritikliğe göre kısa aralıkla taranır.
+    Veritabanına yalnızca durum değiştiğinde yazılır.
+    """
+
+    STATE_KEY = 'inventory_probe_state'
+    SSH_PORT = 22
+
+    # Kritikliğe göre temel tarama aralıkları (saniye)
+    BASE_INTERVALS = {
+        'critical': 30,
+        'high': 60,
+        'medium': 120,
+        'low': 300,
+    }
+    CRITICALITY_ORDER = ['low', 'medium', 'high', 'critical']
+
+    def __init__(self):
+        self.timeout = getattr(settings, 'INVENTORY_PROBE_TIMEOUT', 5)
+        self.max_workers = getattr(settings, 'INVENTORY_PROBE_WORKERS', 64)
+        self.min_interval = getattr(settings, 'INVENTORY_PROBE_MIN_INTERVAL', 15)
+        self.backoff_factor = getattr(settings, 'INVENTORY_PROBE_BACKOFF_FACTOR', 4)
+        self.flap_window = getattr(settings, 'INVENTORY_PROBE_FLAP_WINDOW', 900)
+        self.flap_threshold = getattr(settings, 'INVENTORY_PROBE_FLAP_THRESHOLD', 3)
+        self.health_check = HealthCheckService(timeout=self.timeout, max_workers=self.max_workers)
+
+    # ============ Durum tablosu ============
+
+    def load_state(self) -> Dict[str, list]:
+        return cache.get(self.STATE_KEY) or {}
+
+    def save_state(self, state: Dict[str, list]):
+        cache.set(self.STATE_KEY, state, None)
+
+    def next_interval(self, criticality: str, healthy: bool, previous: Optional[int], changes: List[float]) -> int:
+        """Kritiklik, sağlık ve flapping durumuna göre sonraki tarama aralığı"""
+        base = self.BASE_INTERVALS.get(criticality, self.BASE_INTERVALS['medium'])
+
+        if len(changes) >= self.flap_threshold:
+            return self.min_interval
+        if not healthy:
+            return max(self.min_interval, base // 2)
+        if previous is None:
+            return base
+        # Kararlı ve sağlıklı hedeflerde aralık ikiye katlanarak uzar
+        return min(max(previous * 2, base), base * self.backoff_factor)
+
+    # ============ Probe'lar ============
+
+    def probe_server(self, server: Server) -> bool:
+        try:
+            with socket.create_connection((str(server.ip_address), self.SSH_PORT), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+    def probe_application(self, application: Application) -> Tuple[str, Optional[float]]:
+        return self.health_check.probe(application)
+
+    # ============ Tarama ============
+
+    def _server_criticality(self) -> Dict[int, str]:
+        """Sunucu kritikliği = üzerindeki en kritik aktif uygulama"""
+        rank = {level: index for index, level in enumerate(self.CRITICALITY_ORDER)}
+        criticality = {}
+        for server_id, level in Application.objects.filter(is_active=True).values_list('server_id', 'criticality'):
+            if rank.get(level, 1) > rank.get(criticality.get(server_id), -1):
+                criticality[server_id] = level
+        return criticality
+
+    def _due_targets(self, state: Dict[str, list], now: float) -> List[Tuple[str, str, object]]:
+        """Zamanı gelen hedefler: (state key, kritiklik, model nesnesi)"""
+        targets = []
+        server_criticality = self._server_criticality()
+
+        for server in Server.objects.filter(is_active=True, status='active'):
+            key = f"s:{server.pk}"
+            entry = state.get(key)
+            if entry is None or entry[2] <= now:
+                targets.append((key, server_criticality.get(server.pk, 'medium'), server))
+
+        applications = Application.objects.filter(
+            is_active=True, server__is_active=True
+        ).exclude(status='maintenance').select_related('server')
+
+        for application in applications:
+            key = f"a:{application.pk}"
+            entry = state.get(key)
+            if entry is None or entry[2] <= now:
+                targets.append((key, application.criticality, application))
+
+        return targets
+
+    def _probe(self, target):
+        if isinstance(target, Server):
+            return self.probe_server(target), None
+        return self.probe_application(target)
+
+    def run(self) -> Dict[str, int]:
+        """Zamanı gelen hedefleri eşzamanlı tara, değişenleri veritabanına yaz"""
+        state = self.load_state()
+        now = time.time()
+        targets = self._due_targets(state, now)
+        if not targets:
+            return {'probed': 0, 'changed': 0}
+
+        results = {}
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(targets))
+            ) as executor:
+                futures = {executor.submit(self._probe, target): key for key, _, target in targets}
+                for future in concurrent.futures.as_completed(futures):
+                    key = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        logger.error(f"Probe hatası ({key}): {str(e)}")
+        finally:
+            self.health_check.close()
+
+        checked_at = time.time()
+        db_now = timezone.now()
+        changed_servers = []
+        changed_applications = []
+        latencies = {}
+
+        for key, criticality, target in targets:
+            if key not in results:
+                continue
+            status, response_time = results[key]
+            entry = state.get(key)
+            previous_status = entry[0] if entry else None
+            changes = [at for at in (entry[4] if entry else []) if checked_at - at <= self.flap_window]
+
+            if isinstance(target, Server):
+                db_status = target.ping_status
+                healthy = status is True
+            else:
+                db_status = target.status
+                healthy = status == 'running'
+                latencies[target.pk] = response_time
+
+            if status != previous_status and previous_status is not None:
+                changes.append(checked_at)
+
+            interval = self.next_interval(
+                criticality, healthy, entry[3] if entry and status == previous_status else None, changes
+            )
+            state[key] = [status, checked_at, checked_at + interval, interval, changes]
+
+            if status == db_status:
+                continue
+
+            if isinstance(target, Server):
+                target.ping_status = status
+                target.last_ping = db_now
+                changed_servers.append(target)
+            else:
+                target.status = status
+                if response_time is not None:
+                    target.response_time = response_time
+                target.last_check = db_now
+                changed_applications.append(target)
+
+        if changed_servers:
+            Server.objects.bulk_update(changed_servers, ['ping_status', 'last_ping'])
+        if changed_applications:
+            Application.objects.bulk_update(changed_applications, ['status', 'response_time', 'last_check'])
+            InventoryAggregatesService.invalidate()
+        # Gecikme histogramları her taramada güncellenir (yalnızca cache)
+        record_latencies(latencies, checked_at)
+
+        self.save_state(self._prune(state))
+
+        changed = len(changed_servers) + len(changed_applications)
+        if changed:
+            logger.info(f"Fleet probe: {len(results)} hedef tarandı, {changed} durum değişikliği")
+        return {'probed': len(results), 'changed': changed}
+
+    def _prune(self, state: Dict[str, list]) -> Dict[str, list]:
+        """Silinen/pasif hedeflerin kayıtlarını at (uzun süre taranmamış olanlar)"""
+        horizon = time.time() - max(self.BASE_INTERVALS.values()) * self.backoff_factor * 2
+        return {key: entry for key, entry in state.items() if entry[1] >= horizon}
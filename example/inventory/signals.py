@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Server, Application
+from .services import InventoryAggregatesService
+
+@receiver(post_save, sender=Server)
+@receiver(post_delete, sender=Server)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_inventory_aggregates(sender, instance, **kwargs):
+    """Sunucu/uygulama değiştiğinde envanter sayaçlarını geçersiz kıl"""
+    InventoryAggregatesService.invalidate()
@@ -0,0 +1,16 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from .services import FleetProber
+
+@shared_task
+def probe_fleet():
+    """Zamanı gelen sunucu ve uygulamaları tara, durum değişikliklerini kaydet"""
+    lock_key = 'inventory_probe_lock'
+    if not cache.add(lock_key, 1, getattr(settings, 'INVENTORY_PROBE_LOCK_TIMEOUT', 120)):
+        return 'Tarama zaten çalışıyor'
+    
+    try:
+        return FleetProber().run()
+    finally:
+        cache.delete(lock_key)
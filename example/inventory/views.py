@@ -14,6 +14,8 @@ import csv
 
 from .models import Server, Application, OperationHistory, Certificate
 from .forms import ServerForm, ApplicationForm, OperationHistoryForm, CertificateForm, InventoryFilterForm
+from .services import HealthCheckService, InventoryAggregatesService
+from .latency import get_latency_summary, get_latency_summaries, get_latency_trend
 
 class InventoryListView(LoginRequiredMixin, ListView):
     """Ana envanter listesi - Birleşik görünüm"""
@@ -60,7 +62,7 @@ class InventoryListView(LoginRequiredMixin, ListView):
         if version == 'jboss8':
             queryset = queryset.filter(
                 application_type='jboss',
-                version__icontains='8'
+                version_major=8
             )
         
         # Sıralama
@@ -77,28 +79,23 @@ class InventoryListView(LoginRequiredMixin, ListView):
         # Filtreleme formu
         context['filter_form'] = InventoryFilterForm(self.request.GET)
         
-        # İstatistikler
-        total_apps = Application.objects.filter(is_active=True).count()
+        # Sayfadaki uygulamaların son 1 saatlik gecikme yüzdelikleri
+        latencies = get_latency_summaries([app.pk for app in context['applications']])
+        for app in context['applications']:
+            app.latency = latencies[app.pk]['1h']
+        
+        # İstatistikler (tek sorgu, cache'li)
+        summary = InventoryAggregatesService.get_summary()
         context['stats'] = {
-            'total_applications': total_apps,
-            'running_applications': Application.objects.filter(is_active=True, status='running').count(),
-            'error_applications': Application.objects.filter(is_active=True, status='error').count(),
-            'jboss8_applications': Application.objects.filter(
-                is_active=True, 
-                application_type='jboss',
-                version__icontains='8'
-            ).count(),
+            'total_applications': summary['total_applications'],
+            'running_applications': summary['running_applications'],
+            'error_applications': summary['error_applications'],
+            'jboss8_applications': summary['jboss8_applications'],
         }
         
-        # Ortam dağılımı
-        context['environment_stats'] = Application.objects.filter(is_active=True).values(
-            'server__environment'
-        ).annotate(count=Count('id')).order_by('server__environment')
-        
-        # Uygulama tipi dağılımı
-        context['type_stats'] = Application.objects.filter(is_active=True).values(
-            'application_type'
-        ).annotate(count=Count('id')).order_by('application_type')
+        # Ortam ve uygulama tipi dağılımı
+        context['environment_stats'] = summary['environment_stats']
+        context['type_stats'] = summary['type_stats']
         
         # Aktif filtreler
         context['active_filters'] = {
@@ -139,8 +136,12 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
         
         # Performans metrikleri (son 24 saat)
         # Bu kısım performance modülü ile entegre edilecek
+        latency = get_latency_summary(application.pk)
+        context['latency'] = latency
+        context['latency_trend'] = get_latency_trend(application.pk)
         context['performance_metrics'] = {
-            'avg_response_time': application.response_time or 0,
+            'avg_response_time': latency['24h']['p50'] or application.response_time or 0,
+            'p95_response_time': latency['24h']['p95'],
             'uptime_percentage': 99.5,  # Örnek veri
             'last_downtime': None,
         }
@@ -219,12 +220,7 @@ class ServerDetailView(LoginRequiredMixin, DetailView):
         context['applications'] = server.applications.filter(is_active=True)
         
         # Sunucu istatistikleri
-        context['app_stats'] = {
-            'total': server.applications.filter(is_active=True).count(),
-            'running': server.applications.filter(is_active=True, status='running').count(),
-            'stopped': server.applications.filter(is_active=True, status='stopped').count(),
-            'error': server.applications.filter(is_active=True, status='error').count(),
-        }
+        context['app_stats'] = InventoryAggregatesService.get_server_stats(server)
         
         return context
 
@@ -292,11 +288,10 @@ def bulk_status_check(request):
     """Toplu durum kontrolü"""
     if request.method == 'POST':
         app_ids = request.POST.getlist('application_ids')
-        applications = Application.objects.filter(id__in=app_ids, is_active=True)
+        applications = Application.objects.filter(id__in=app_ids, is_active=True).select_related('server')
         
         results = []
-        for app in applications:
-            app.check_status()
+        for app in HealthCheckService().check_applications(applications):
             results.append({
                 'id': app.id,
                 'name': app.name,
@@ -343,28 +338,12 @@ def export_inventory(request):
 @login_required
 def inventory_stats_api(request):
     """Envanter istatistikleri API"""
+    summary = InventoryAggregatesService.get_summary()
     stats = {
-        'total_applications': Application.objects.filter(is_active=True).count(),
-        'total_servers': Server.objects.filter(is_active=True).count(),
-        'running_applications': Application.objects.filter(is_active=True, status='running').count(),
-        'error_applications': Application.objects.filter(is_active=True, status='error').count(),
-        'jboss8_applications': Application.objects.filter(
-            is_active=True, 
-            application_type='jboss',
-            version__icontains='8'
-        ).count(),
-        'total_jboss_applications': Application.objects.filter(
-            is_active=True, 
-            application_type='jboss'
-        ).count(),
-    }
-    
-    # JBoss 8 migrasyon yüzdesi
-    if stats['total_jboss_applications'] > 0:
-        stats['jboss8_percentage'] = round(
-            (stats['jboss8_applications'] / stats['total_jboss_applications']) * 100, 1
+        key: summary[key] for key in (
+            'total_applications', 'total_servers', 'running_applications', 'error_applications',
+            'jboss8_applications', 'total_jboss_applications', 'jboss8_percentage',
         )
-    else:
-        stats['jboss8_percentage'] = 0
+    }
     
     return JsonResponse(stats)
@@ -21,6 +21,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -136,6 +137,7 @@ CACHES = {
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 SESSION_COOKIE_AGE = 86400  # 24 hours
+SESSION_ACTIVITY_GRANULARITY = config('SESSION_ACTIVITY_GRANULARITY', default=60, cast=int)  # seconds, last_activity yazma aralığı
 
 # Email
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -156,6 +158,34 @@ CELERY_TIMEZONE = TIME_ZONE
 
 # Celery Beat
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    'performance-prewarm-dashboards': {
+        'task': 'performance.tasks.prewarm_dashboards',
+        'schedule': config('PERFORMANCE_PREWARM_INTERVAL', default=90, cast=int),  # seconds, dynatrace TTL'inden (120s) kısa
+        'options': {'queue': 'prewarm'},
+    },
+    'performance-collect-metrics': {
+        'task': 'performance.tasks.collect_metrics',
+        'schedule': config('PERFORMANCE_COLLECT_INTERVAL', default=60, cast=int),  # seconds
+    },
+    'performance-ingest-observability-logs': {
+        'task': 'performance.tasks.ingest_observability_logs',
+        'schedule': config('OBSERVABILITY_LOG_INGEST_INTERVAL', default=300, cast=int),  # seconds, 1h pencere ile örtüşür
+    },
+    'performance-maintain-log-partitions': {
+        'task': 'performance.tasks.maintain_observability_log_partitions',
+        'schedule': config('OBSERVABILITY_LOG_MAINTENANCE_INTERVAL', default=86400, cast=int),  # seconds (daily)
+    },
+    'inventory-probe-fleet': {
+        'task': 'inventory.tasks.probe_fleet',
+        'schedule': config('INVENTORY_PROBE_TICK', default=15, cast=int),  # seconds, hedefler kendi aralıklarıyla taranır
+    },
+    'authentication-flush-session-activity': {
+        'task': 'authentication.tasks.flush_session_activity',
+        'schedule': config('SESSION_ACTIVITY_FLUSH_INTERVAL', default=30, cast=int),  # seconds
+    },
+}
+SESSION_ACTIVITY_FLUSH_INTERVAL = CELERY_BEAT_SCHEDULE['authentication-flush-session-activity']['schedule']  # seconds
 
 # Haystack (Search)
 HAYSTACK_CONNECTIONS = {
@@ -171,6 +201,8 @@ LDAP_SERVER_URI = config('LDAP_SERVER_URI', default='ldap://localhost:389')
 LDAP_BIND_DN = config('LDAP_BIND_DN', default='')
 LDAP_BIND_PASSWORD = config('LDAP_BIND_PASSWORD', default='')
 LDAP_USER_SEARCH_BASE = config('LDAP_USER_SEARCH_BASE', default='ou=users,dc=example,dc=com')
+LDAP_USER_SEARCH_FILTER = config('LDAP_USER_SEARCH_FILTER', default='(objectClass=person)')
+LDAP_SYNC_PAGE_SIZE = config('LDAP_SYNC_PAGE_SIZE', default=1000, cast=int)
 
 # Certificate Management Settings
 APPVIEWX_API_URL = config('APPVIEWX_API_URL', default='https://appviewx.example.com/api/v1')
@@ -179,6 +211,15 @@ APPVIEWX_API_KEY = config('APPVIEWX_API_KEY', default='')
 # AskGT Document Sync Settings
 ASKGT_SYNC_ENABLED = config('ASKGT_SYNC_ENABLED', default=True, cast=bool)
 ASKGT_SYNC_INTERVAL = config('ASKGT_SYNC_INTERVAL', default=60, cast=int)  # minutes
+ASKGT_SYNC_WORKERS = config('ASKGT_SYNC_WORKERS', default=4, cast=int)
+ASKGT_SYNC_TIMEOUT = config('ASKGT_SYNC_TIMEOUT', default=30, cast=int)  # seconds, istek başına
+ASKGT_SYNC_RETRIES = config('ASKGT_SYNC_RETRIES', default=3, cast=int)  # 429/5xx/bağlantı hataları için istek tekrarı
+ASKGT_SYNC_SOURCE_RETRIES = config('ASKGT_SYNC_SOURCE_RETRIES', default=1, cast=int)  # başarısız kaynak tekrar denemesi
+ASKGT_SYNC_BACKOFF = config('ASKGT_SYNC_BACKOFF', default=2, cast=float)  # seconds, üstel bekleme çarpanı
+ASKGT_CONFLUENCE_TIMEZONE = config('ASKGT_CONFLUENCE_TIMEZONE', default=TIME_ZONE)  # CQL tarihlerinin yorumlandığı saat dilimi
+ASKGT_CONFLUENCE_CURSOR_MARGIN = config('ASKGT_CONFLUENCE_CURSOR_MARGIN', default=60, cast=int)  # minutes, artımlı sorgu payı
+ASKGT_SEARCH_CONFIG = config('ASKGT_SEARCH_CONFIG', default='turkish')  # PostgreSQL text search config
+ASKGT_TYPEAHEAD_DEBOUNCE = config('ASKGT_TYPEAHEAD_DEBOUNCE', default=5, cast=int)  # seconds, değişiklikler toplu uygulanır
 
 # Duty Schedule Settings
 DUTY_SYNC_ENABLED = config('DUTY_SYNC_ENABLED', default=True, cast=bool)
@@ -191,6 +232,42 @@ ANSIBLE_TOWER_PASSWORD = config('ANSIBLE_TOWER_PASSWORD', default='')
 ANSIBLE_TOWER_TOKEN = config('ANSIBLE_TOWER_TOKEN', default='')
 ANSIBLE_SYNC_INTERVAL = config('ANSIBLE_SYNC_INTERVAL', default=60, cast=int)  # minutes
 
+# Performance Alert Settings
+PERFORMANCE_ALERT_HYSTERESIS = config('PERFORMANCE_ALERT_HYSTERESIS', default=0.05, cast=float)  # eşiğin oranı
+PERFORMANCE_ALERT_MIN_DURATION = config('PERFORMANCE_ALERT_MIN_DURATION', default=120, cast=int)  # seconds
+PERFORMANCE_COLLECT_LOCK_TIMEOUT = config('PERFORMANCE_COLLECT_LOCK_TIMEOUT', default=300, cast=int)  # seconds
+
+# Observability Log Settings
+OBSERVABILITY_LOG_RETENTION_DAYS = config('OBSERVABILITY_LOG_RETENTION_DAYS', default=30, cast=int)
+
+# Observability Cache Settings (stale-while-revalidate)
+OBSERVABILITY_CACHE_STALE_FACTOR = config('OBSERVABILITY_CACHE_STALE_FACTOR', default=4, cast=int)  # hard TTL = soft TTL x factor
+OBSERVABILITY_CACHE_REFRESH_WORKERS = config('OBSERVABILITY_CACHE_REFRESH_WORKERS', default=4, cast=int)
+OBSERVABILITY_CACHE_LOCK_TIMEOUT = config('OBSERVABILITY_CACHE_LOCK_TIMEOUT', default=90, cast=int)  # seconds
+OBSERVABILITY_CACHE_MISS_WAIT = config('OBSERVABILITY_CACHE_MISS_WAIT', default=30, cast=int)  # seconds
+
+# Dashboard Prewarm Settings
+PERFORMANCE_PREWARM_INTERVAL = CELERY_BEAT_SCHEDULE['performance-prewarm-dashboards']['schedule']  # seconds, yenileme penceresi
+PERFORMANCE_PREWARM_TIME_RANGES = config('PERFORMANCE_PREWARM_TIME_RANGES', default='1h,6h,24h', cast=lambda v: [s.strip() for s in v.split(',')])
+PERFORMANCE_PREWARM_CONCURRENCY = config('PERFORMANCE_PREWARM_CONCURRENCY', default=2, cast=int)
+PERFORMANCE_PREWARM_MAX_APPLICATIONS = config('PERFORMANCE_PREWARM_MAX_APPLICATIONS', default=50, cast=int)
+PERFORMANCE_PREWARM_LOCK_TIMEOUT = config('PERFORMANCE_PREWARM_LOCK_TIMEOUT', default=600, cast=int)  # seconds
+
+# Live Stream (SSE) Settings
+PERFORMANCE_STREAM_POLL_INTERVAL = config('PERFORMANCE_STREAM_POLL_INTERVAL', default=2, cast=int)  # seconds
+PERFORMANCE_STREAM_MAX_DURATION = config('PERFORMANCE_STREAM_MAX_DURATION', default=25, cast=int)  # seconds, WSGI worker'ı kısa tutulur
+
+# Inventory Health Check Settings
+INVENTORY_HEALTH_CHECK_TIMEOUT = config('INVENTORY_HEALTH_CHECK_TIMEOUT', default=10, cast=int)  # seconds
+INVENTORY_HEALTH_CHECK_WORKERS = config('INVENTORY_HEALTH_CHECK_WORKERS', default=32, cast=int)
+INVENTORY_PROBE_TIMEOUT = config('INVENTORY_PROBE_TIMEOUT', default=5, cast=int)  # seconds
+INVENTORY_PROBE_WORKERS = config('INVENTORY_PROBE_WORKERS', default=64, cast=int)
+INVENTORY_PROBE_MIN_INTERVAL = config('INVENTORY_PROBE_MIN_INTERVAL', default=15, cast=int)  # seconds
+INVENTORY_PROBE_BACKOFF_FACTOR = config('INVENTORY_PROBE_BACKOFF_FACTOR', default=4, cast=int)
+INVENTORY_PROBE_FLAP_WINDOW = config('INVENTORY_PROBE_FLAP_WINDOW', default=900, cast=int)  # seconds
+INVENTORY_PROBE_FLAP_THRESHOLD = config('INVENTORY_PROBE_FLAP_THRESHOLD', default=3, cast=int)
+INVENTORY_PROBE_LOCK_TIMEOUT = config('INVENTORY_PROBE_LOCK_TIMEOUT', default=120, cast=int)  # seconds
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+from performance.services.log_persistence import LogPersistenceService
+
+class Command(BaseCommand):
+    help = 'Observability log partition\'larını yönet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Mevcut tabloyu timestamp üzerinden partitioned tabloya dönüştür',
+        )
+        parser.add_argument(
+            '--days-ahead',
+            type=int,
+            default=3,
+            help='Önceden oluşturulacak günlük partition sayısı (varsayılan: 3)',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            help='Bu günden eski partition\'ları sil (varsayılan: OBSERVABILITY_LOG_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        service = LogPersistenceService()
+        
+        if options['convert']:
+            if service.convert_to_partitioned():
+                self.stdout.write(self.style.SUCCESS('Tablo partitioned yapıya dönüştürüldü'))
+            else:
+                self.stdout.write(self.style.WARNING('Tablo zaten partitioned'))
+        
+        now = timezone.now()
+        service.ensure_partitions(now, now + timedelta(days=options['days_ahead']))
+        dropped = service.drop_expired_partitions(options.get('retention_days'))
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Partition sayısı: {len(service.list_partitions())}, silinen: {len(dropped)}'
+            )
+        )
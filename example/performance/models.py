@@ -1,6 +1,8 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from core.models import BaseModel
 from inventory.models import Server, Application
+import hashlib
 import json
 
 class MetricSource(BaseModel):
@@ -116,24 +118,68 @@ class MetricDefinition(BaseModel):
     def __str__(self):
         return f"{self.display_name} ({self.technology.display_name})"
 
-class MetricData(BaseModel):
-    """Metrik verileri (cache için)"""
-    metric = models.ForeignKey(MetricDefinition, on_delete=models.CASCADE, verbose_name="Metrik")
+class MetricSeriesManager(models.Manager):
+    """Seri sözlüğü yöneticisi"""
+
+    def get_for_labels(self, metric, labels=None):
+        """(metrik, etiket seti) için seriyi bul veya oluştur"""
+        labels = labels or {}
+        series, created = self.get_or_create(
+            series_hash=MetricSeries.compute_hash(metric.pk, labels),
+            defaults={'metric': metric, 'labels': labels}
+        )
+        return series
+
+    def matching(self, metric, **labels):
+        """Etiket filtresine uyan serileri döndür (GIN index kullanır)"""
+        queryset = self.filter(metric=metric)
+        if labels:
+            queryset = queryset.filter(labels__contains=labels)
+        return queryset
+
+class MetricSeries(models.Model):
+    """Tekil (metrik, etiket seti) serileri - etiketler örnek başına değil seri başına saklanır"""
+    metric = models.ForeignKey(MetricDefinition, on_delete=models.CASCADE, related_name='series', verbose_name="Metrik")
+    series_hash = models.CharField(max_length=40, unique=True, verbose_name="Seri Hash")
+    labels = models.JSONField(default=dict, verbose_name="Etiketler")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma")
+
+    objects = MetricSeriesManager()
+
+    class Meta:
+        verbose_name = "Metrik Serisi"
+        verbose_name_plural = "Metrik Serileri"
+        indexes = [
+            models.Index(fields=['metric']),
+            GinIndex(fields=['labels'], name='metricseries_labels_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric.name} {self.labels}"
+
+    @staticmethod
+    def compute_hash(metric_id, labels):
+        """Metrik ve etiket setinden kararlı seri hash'i üret"""
+        canonical = json.dumps(labels or {}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(f"{metric_id}|{canonical}".encode('utf-8')).hexdigest()
+
+class MetricData(models.Model):
+    """Metrik verileri (cache için) - yalnızca seri, zaman ve değer"""
+    series = models.ForeignKey(MetricSeries, on_delete=models.CASCADE, related_name='samples', verbose_name="Seri")
     timestamp = models.DateTimeField(verbose_name="Zaman Damgası")
     value = models.FloatField(verbose_name="Değer")
-    labels = models.JSONField(default=dict, verbose_name="Etiketler")
     
     class Meta:
         verbose_name = "Metrik Verisi"
         verbose_name_plural = "Metrik Verileri"
         ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['metric', '-timestamp']),
+            models.Index(fields=['series', '-timestamp']),
             models.Index(fields=['timestamp']),
         ]
 
     def __str__(self):
-        return f"{self.metric.name} - {self.timestamp}"
+        return f"{self.series.metric.name} - {self.timestamp}"
 
 class Alert(BaseModel):
     """Performans uyarıları"""
@@ -212,16 +258,20 @@ class ObservabilityLog(BaseModel):
     source_platform = models.CharField(max_length=20, choices=SOURCE_PLATFORMS, verbose_name="Kaynak Platform")
     deep_link_url = models.URLField(verbose_name="Deep Link URL")
     metadata = models.JSONField(default=dict, verbose_name="Metadata")
+    fingerprint = models.CharField(max_length=40, verbose_name="Parmak İzi", help_text="Tekrar eden kayıtları engellemek için")
     
     class Meta:
         verbose_name = "Observability Log"
         verbose_name_plural = "Observability Logları"
         ordering = ['-timestamp']
+        # Tablo timestamp üzerinden range-partition edilir (bkz. manage_log_partitions)
         indexes = [
-            models.Index(fields=['-timestamp']),
-            models.Index(fields=['application_name']),
-            models.Index(fields=['log_level']),
-            models.Index(fields=['source_platform']),
+            models.Index(fields=['-timestamp'], name='obslog_ts_idx'),
+            models.Index(fields=['application_name', '-timestamp'], name='obslog_app_ts_idx'),
+            models.Index(fields=['source_platform', 'log_level', '-timestamp'], name='obslog_platform_level_ts_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['timestamp', 'fingerprint'], name='obslog_ts_fingerprint_uniq'),
         ]
 
     def __str__(self):
@@ -238,3 +288,16 @@ class ObservabilityLog(BaseModel):
             'CRITICAL': 'dark',
         }
         return colors.get(self.log_level, 'secondary')
+
+class ObservabilityApplication(models.Model):
+    """Log'lardan türetilen uygulama adı listesi (ingest sırasında güncellenir)"""
+    name = models.CharField(max_length=100, unique=True, verbose_name="Uygulama Adı")
+    last_seen = models.DateTimeField(verbose_name="Son Görülme")
+    
+    class Meta:
+        verbose_name = "Observability Uygulaması"
+        verbose_name_plural = "Observability Uygulamaları"
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
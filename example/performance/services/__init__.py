@@ -0,0 +1 @@
+from .metrics import AlertManager, MetricCollector, PerformanceService
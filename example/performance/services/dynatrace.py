@@ -1,10 +1,12 @@
 import requests
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 from typing import Dict, List, Optional, Any
+from .metric_stats import summarize_series, merge_series
+from .event_stream import publish_event
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,50 +34,92 @@ class DynatraceService:
             logger.error(f"Dynatrace API hatası: {str(e)}")
             return None
     
-    def _get_cached_data(self, cache_key: str, fetch_func, cache_timeout: int = 300):
+    def _get_cached_data(self, cache_key: str, fetch_func, cache_timeout: int = 300, refresh: bool = False):
         """Cache'den veri al veya API'den çek"""
-        data = cache.get(cache_key)
+        data = None if refresh else cache.get(cache_key)
         if data is None:
             data = fetch_func()
             if data:
                 cache.set(cache_key, data, cache_timeout)
         return data
     
-    def get_technology_metrics(self, technology: str, time_range: str = '1h') -> Dict:
+    def get_technology_metrics(self, technology: str, time_range: str = '1h', refresh: bool = False) -> Dict:
         """Teknoloji bazlı metrikleri getir"""
         cache_key = f"dynatrace_metrics_{technology}_{time_range}"
         
         def fetch_metrics():
-            # Zaman aralığını hesapla
-            end_time = timezone.now()
-            time_ranges = {
-                '1h': timedelta(hours=1),
-                '6h': timedelta(hours=6),
-                '24h': timedelta(hours=24),
-                '7d': timedelta(days=7),
-                '30d': timedelta(days=30),
-            }
-            start_time = end_time - time_ranges.get(time_range, timedelta(hours=1))
+            return self._fetch_incremental_metrics(technology, time_range)
+        
+        return self._get_cached_data(cache_key, fetch_metrics, 120, refresh)
+    
+    def _fetch_incremental_metrics(self, technology: str, time_range: str) -> Dict:
+        """Önbellekteki seriyi koru, Dynatrace'den yalnızca son zaman damgasından sonrasını çek"""
+        end_time = timezone.now()
+        time_ranges = {
+            '1h': timedelta(hours=1),
+            '6h': timedelta(hours=6),
+            '24h': timedelta(hours=24),
+            '7d': timedelta(days=7),
+            '30d': timedelta(days=30),
+        }
+        window = time_ranges.get(time_range, timedelta(hours=1))
+        start_time = end_time - window
+        window_start = int(start_time.timestamp() * 1000)
+        
+        # Seri durumu, sonuç cache'inden (120s) daha uzun yaşar
+        state_key = f"dynatrace_series_{technology}_{time_range}"
+        state = cache.get(state_key) or {}
+        new_state = {}
+        
+        # Teknoloji bazlı metrik sorgularını tanımla
+        metric_queries = self._get_technology_queries(technology)
+        
+        results = {}
+        for metric_name, query in metric_queries.items():
+            series = state.get(metric_name)
+            if series and series['timestamps'] and series['timestamps'][-1] >= window_start:
+                # Son kova kısmi olabilir, ondan itibaren yeniden çek
+                fetch_from = datetime.fromtimestamp(series['timestamps'][-1] / 1000, tz=dt_timezone.utc)
+            else:
+                series = None
+                fetch_from = start_time
             
-            # Teknoloji bazlı metrik sorgularını tanımla
-            metric_queries = self._get_technology_queries(technology)
+            params = {
+                'metricSelector': query,
+                'from': fetch_from.isoformat(),
+                'to': end_time.isoformat(),
+                'resolution': self._get_resolution(time_range)
+            }
             
-            results = {}
-            for metric_name, query in metric_queries.items():
-                params = {
-                    'metricSelector': query,
-                    'from': start_time.isoformat(),
-                    'to': end_time.isoformat(),
-                    'resolution': self._get_resolution(time_range)
-                }
+            data = self._make_request('metrics/query', params)
+            if data and 'result' in data:
+                timestamps, values = self._extract_points(data['result'])
+                previous_last = series['timestamps'][-1] if series else None
+                series = merge_series(series, timestamps, values, window_start)
                 
-                data = self._make_request('metrics/query', params)
-                if data and 'result' in data:
-                    results[metric_name] = self._process_metric_data(data['result'])
+                if time_range == '1h' and previous_last is not None:
+                    self._publish_new_points(technology, metric_name, timestamps, values, previous_last)
+            elif series:
+                # API hatasında eldeki seriyi pencereye göre kırparak kullan
+                series = merge_series(series, [], [], window_start)
+            else:
+                continue
             
-            return results
+            new_state[metric_name] = series
+            results[metric_name] = summarize_series(series['timestamps'], series['values'])
         
-        return self._get_cached_data(cache_key, fetch_metrics, 120)
+        cache.set(state_key, new_state, int(window.total_seconds()))
+        return results
+    
+    def _publish_new_points(self, technology: str, metric_name: str, timestamps: List, values: List, previous_last: int):
+        """Canlı akışa yalnızca daha önce görülmemiş noktaları gönder"""
+        new_points = [(ts, value) for ts, value in zip(timestamps, values) if ts > previous_last]
+        if new_points:
+            publish_event(technology, 'metric_batch', {
+                'metric': metric_name,
+                'timestamps': [ts for ts, _ in new_points],
+                'values': [value for _, value in new_points],
+            })
     
     def _get_technology_queries(self, technology: str) -> Dict[str, str]:
         """Teknoloji bazlı metrik sorgularını döndür"""
@@ -135,35 +179,22 @@ class DynatraceService:
     
     def _process_metric_data(self, result_data: List) -> Dict:
         """Metrik verisini işle"""
+        timestamps, values = self._extract_points(result_data)
+        return summarize_series(timestamps, values)
+    
+    def _extract_points(self, result_data: List):
+        """Sonuçtan (timestamps, values) listelerini çıkar"""
         if not result_data:
-            return {'values': [], 'timestamps': [], 'current': 0, 'average': 0}
+            return [], []
         
         # İlk sonucu al (genellikle tek sonuç olur)
         metric_result = result_data[0]
-        data_points = metric_result.get('data', [])
+        data_points = [point for point in metric_result.get('data', []) if point.get('values')]
         
-        if not data_points:
-            return {'values': [], 'timestamps': [], 'current': 0, 'average': 0}
+        values = [point['values'][0] for point in data_points]
+        timestamps = [point['timestamp'] for point in data_points]
         
-        values = []
-        timestamps = []
-        
-        for point in data_points:
-            if point.get('values') and len(point['values']) > 0:
-                values.append(point['values'][0])
-                timestamps.append(point['timestamp'])
-        
-        current_value = values[-1] if values else 0
-        average_value = sum(values) / len(values) if values else 0
-        
-        return {
-            'values': values,
-            'timestamps': timestamps,
-            'current': round(current_value, 2),
-            'average': round(average_value, 2),
-            'min': round(min(values), 2) if values else 0,
-            'max': round(max(values), 2) if values else 0,
-        }
+        return timestamps, values
     
     def get_host_metrics(self, host_id: str, time_range: str = '1h') -> Dict:
         """Host bazlı metrikleri getir"""
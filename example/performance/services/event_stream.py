@@ -0,0 +1,90 @@
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from typing import Dict, Iterator, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+EVENT_TTL = 600  # Olaylar yeniden bağlanan istemciler için 10 dakika tutulur
+MAX_BACKLOG = 500
+
+# Olay tipleri ve veri şemaları:
+#   metric        {metric_id, metric, series_id, timestamp, value}  - toplanan tek nokta
+#   metric_batch  {metric, timestamps[], values[]}                  - Dynatrace'ten gelen yeni noktalar
+#   alert         {metric_id, metric, previous_state, state, alert_id, value} - uyarı durum geçişi
+
+def _seq_key(technology: str) -> str:
+    return f"perf_events:{technology}:seq"
+
+def _event_key(technology: str, event_id: int) -> str:
+    return f"perf_events:{technology}:{event_id}"
+
+def publish_event(technology: str, event_type: str, payload: Dict) -> int:
+    """Teknoloji kanalına yeni bir olay (metrik noktası / uyarı geçişi) ekle"""
+    try:
+        seq_key = _seq_key(technology)
+        cache.add(seq_key, 0, None)
+        event_id = cache.incr(seq_key)
+        cache.set(_event_key(technology, event_id), {'type': event_type, 'data': payload}, EVENT_TTL)
+        return event_id
+    except Exception as e:
+        logger.error(f"Olay yayınlanamadı ({technology}/{event_type}): {str(e)}")
+        return 0
+
+def last_event_id(technology: str) -> int:
+    return cache.get(_seq_key(technology)) or 0
+
+def read_events(technology: str, after_id: int) -> List[Tuple[int, Dict]]:
+    """after_id'den sonraki olayları sırayla döndür"""
+    latest = last_event_id(technology)
+    if latest <= after_id:
+        return []
+
+    first = max(after_id + 1, latest - MAX_BACKLOG + 1)
+    keys = {_event_key(technology, event_id): event_id for event_id in range(first, latest + 1)}
+    found = cache.get_many(list(keys))
+
+    return sorted(
+        (keys[key], event) for key, event in found.items()
+    )
+
+def format_sse(event_id: int, event_type: str, data: Dict) -> str:
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+def sse_stream(technology: str, last_id: int = None) -> Iterator[str]:
+    """
+    Server-Sent Events akışı üret.
+
+    Yalnızca yeni olaylar gönderilir. Senkron (WSGI) worker'ı uzun süre
+    tutmamak için bağlantı ilk olay grubundan sonra ya da en geç
+    PERFORMANCE_STREAM_MAX_DURATION sonunda kapanır (long-polling); tarayıcı
+    Last-Event-ID ile kaldığı yerden yeniden bağlanır.
+    """
+    poll_interval = getattr(settings, 'PERFORMANCE_STREAM_POLL_INTERVAL', 2)
+    max_duration = getattr(settings, 'PERFORMANCE_STREAM_MAX_DURATION', 25)
+    heartbeat_interval = 15
+
+    cursor = last_event_id(technology) if last_id is None else last_id
+    started = last_heartbeat = time.monotonic()
+
+    yield f"retry: {poll_interval * 1000}\n\n"
+
+    while time.monotonic() - started < max_duration:
+        events = read_events(technology, cursor)
+        for event_id, event in events:
+            yield format_sse(event_id, event['type'], event['data'])
+            cursor = event_id
+
+        if events:
+            return
+
+        now = time.monotonic()
+        if now - last_heartbeat >= heartbeat_interval:
+            yield ": keep-alive\n\n"
+            last_heartbeat = now
+
+        time.sleep(poll_interval)
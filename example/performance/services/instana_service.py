@@ -2,7 +2,7 @@ import requests
 import json
 from datetime import datetime, timedelta
 from django.conf import settings
-from django.core.cache import cache
+from .swr_cache import get_or_refresh
 from django.utils import timezone
 from typing import Dict, List, Optional
 import logging
@@ -162,9 +162,9 @@ class InstanaService:
             
             return logs
         
-        return cache.get_or_set(cache_key, fetch_error_logs, 300)
+        return get_or_refresh(cache_key, fetch_error_logs, 300)
     
-    def get_application_metrics(self, application_name: str, time_range: str = '24h') -> Dict:
+    def get_application_metrics(self, application_name: str, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Uygulama metriklerini getir"""
         cache_key = f"instana_metrics_{application_name}_{time_range}"
         
@@ -205,9 +205,9 @@ class InstanaService:
             
             return metrics
         
-        return cache.get_or_set(cache_key, fetch_metrics, 300)
+        return get_or_refresh(cache_key, fetch_metrics, 300, refresh=refresh)
     
-    def get_dashboard_summary(self, time_range: str = '24h') -> Dict:
+    def get_dashboard_summary(self, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Dashboard özet bilgilerini getir"""
         cache_key = f"instana_dashboard_summary_{time_range}"
         
@@ -281,7 +281,7 @@ class InstanaService:
             
             return summary
         
-        return cache.get_or_set(cache_key, fetch_summary, 300)
+        return get_or_refresh(cache_key, fetch_summary, 300, refresh=refresh)
     
     def get_trace_analytics(self, application_name: str = None, time_range: str = '24h') -> Dict:
         """Trace analitik verilerini getir"""
@@ -351,4 +351,4 @@ class InstanaService:
             
             return analytics
         
-        return cache.get_or_set(cache_key, fetch_traces, 300)
+        return get_or_refresh(cache_key, fetch_traces, 300)
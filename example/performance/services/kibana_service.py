@@ -2,7 +2,7 @@ import requests
 import json
 from datetime import datetime, timedelta
 from django.conf import settings
-from django.core.cache import cache
+from .swr_cache import get_or_refresh
 from django.utils import timezone
 from typing import Dict, List, Optional
 import logging
@@ -165,9 +165,9 @@ class KibanaService:
             
             return logs
         
-        return cache.get_or_set(cache_key, fetch_error_logs, 300)
+        return get_or_refresh(cache_key, fetch_error_logs, 300)
     
-    def get_application_metrics(self, application_name: str, time_range: str = '24h') -> Dict:
+    def get_application_metrics(self, application_name: str, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Uygulama metriklerini getir"""
         cache_key = f"kibana_metrics_{application_name}_{time_range}"
         
@@ -224,9 +224,9 @@ class KibanaService:
             
             return metrics
         
-        return cache.get_or_set(cache_key, fetch_metrics, 300)
+        return get_or_refresh(cache_key, fetch_metrics, 300, refresh=refresh)
     
-    def get_dashboard_summary(self, time_range: str = '24h') -> Dict:
+    def get_dashboard_summary(self, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Dashboard özet bilgilerini getir"""
         cache_key = f"kibana_dashboard_summary_{time_range}"
         
@@ -326,7 +326,7 @@ class KibanaService:
                 ]
             }
         
-        return cache.get_or_set(cache_key, fetch_summary, 300)
+        return get_or_refresh(cache_key, fetch_summary, 300, refresh=refresh)
     
     def get_log_timeline(self, application_name: str = None, time_range: str = '24h') -> Dict:
         """Log zaman çizelgesi getir"""
@@ -396,4 +396,4 @@ class KibanaService:
                 'error_counts': error_counts
             }
         
-        return cache.get_or_set(cache_key, fetch_timeline, 300)
+        return get_or_refresh(cache_key, fetch_timeline, 300)
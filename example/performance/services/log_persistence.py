@@ -0,0 +1,277 @@
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from typing import Dict, List, Optional
+from ..models import ObservabilityLog, ObservabilityApplication
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = re.compile(r'_p(\d{8})$')
+
+def parse_log_timestamp(value) -> Optional[datetime]:
+    """Platformlardan gelen farklı formatlardaki zaman damgasını aware datetime'a çevir"""
+    if value in (None, ''):
+        return None
+
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        # Epoch milisaniye (Instana) veya saniye
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+    else:
+        try:
+            parsed = parse_datetime(str(value).strip().replace(' ', 'T', 1))
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            return None
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+class LogPersistenceService:
+    """Normalize edilmiş observability loglarını toplu olarak kaydeder"""
+
+    BATCH_SIZE = 1000
+
+    def __init__(self):
+        self.table = ObservabilityLog._meta.db_table
+        self.retention_days = getattr(settings, 'OBSERVABILITY_LOG_RETENTION_DAYS', 30)
+
+    def ingest(self, logs: List[Dict]) -> int:
+        """Logları partition'lara toplu yaz, yeni eklenen kayıt sayısını döndür"""
+        records = {}
+        applications = {}
+
+        for log in logs:
+            timestamp = parse_log_timestamp(log.get('timestamp'))
+            if timestamp is None:
+                continue
+
+            app_name = (log.get('application_name') or 'Unknown')[:100]
+            fingerprint = self._fingerprint(log, timestamp)
+            # Aynı çağrıdaki tekrarlar tek kayda indirilir
+            records[(timestamp, fingerprint)] = ObservabilityLog(
+                timestamp=timestamp,
+                log_level=log.get('log_level') or 'ERROR',
+                message=log.get('message') or '',
+                application_name=app_name,
+                host_name=(log.get('host_name') or '')[:100],
+                source_platform=log.get('source_platform') or '',
+                deep_link_url=log.get('deep_link_url') or '',
+                metadata=log.get('metadata') or {},
+                fingerprint=fingerprint,
+            )
+
+            if app_name not in applications or applications[app_name] < timestamp:
+                applications[app_name] = timestamp
+
+        if not records:
+            return 0
+
+        oldest = min(timestamp for timestamp, _ in records)
+        newest = max(timestamp for timestamp, _ in records)
+        self.ensure_partitions(oldest, newest)
+
+        # ignore_conflicts atlanan satırları bildirmez; daha önce yazılmış
+        # kayıtlar önceden ayıklanır, böylece dönen sayı gerçekten eklenenlerdir
+        new_records = self._exclude_existing(records, oldest, newest)
+
+        with transaction.atomic():
+            ObservabilityLog.objects.bulk_create(
+                new_records,
+                batch_size=self.BATCH_SIZE,
+                ignore_conflicts=True
+            )
+            self._refresh_applications(applications)
+
+        logger.info(
+            f"Observability log ingest: {len(new_records)} yeni kayıt "
+            f"({len(records) - len(new_records)} tekrar atlandı), {len(applications)} uygulama"
+        )
+        return len(new_records)
+
+    def _exclude_existing(self, records: Dict, oldest: datetime, newest: datetime) -> List[ObservabilityLog]:
+        keys = list(records)
+        existing = set()
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            batch = keys[start:start + self.BATCH_SIZE]
+            existing.update(
+                ObservabilityLog.objects.filter(
+                    timestamp__gte=oldest,
+                    timestamp__lte=newest,
+                    fingerprint__in=[fingerprint for _, fingerprint in batch]
+                ).values_list('timestamp', 'fingerprint')
+            )
+        return [record for key, record in records.items() if key not in existing]
+
+    def _index_definitions(self) -> Dict[str, str]:
+        """ObservabilityLog.Meta.indexes'ten index adı -> kolon listesi DDL'i"""
+        definitions = {}
+        for index in ObservabilityLog._meta.indexes:
+            columns = []
+            for field_name, order in index.fields_orders:
+                column = connection.ops.quote_name(ObservabilityLog._meta.get_field(field_name).column)
+                columns.append(f'{column} {order}'.strip())
+            definitions[index.name] = ', '.join(columns)
+        return definitions
+
+    def _fingerprint(self, log: Dict, timestamp: datetime) -> str:
+        """Aynı logun tekrar yazılmasını önleyen parmak izi"""
+        key = '|'.join([
+            log.get('source_platform') or '',
+            timestamp.isoformat(),
+            log.get('host_name') or '',
+            log.get('application_name') or '',
+            str(log.get('message') or ''),
+        ])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _refresh_applications(self, applications: Dict[str, datetime]):
+        """Uygulama adı listesini upsert et"""
+        ObservabilityApplication.objects.bulk_create(
+            [ObservabilityApplication(name=name, last_seen=last_seen) for name, last_seen in applications.items()],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['last_seen'],
+        )
+
+    # ============ Partition yönetimi ============
+
+    def partition_name(self, day) -> str:
+        return f"{self.table}_p{day:%Y%m%d}"
+
+    def is_partitioned(self) -> bool:
+        """Tablo manage_log_partitions --convert ile dönüştürülmüş mü (relkind = 'p')"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [self.table])
+            row = cursor.fetchone()
+        return bool(row) and row[0] == 'p'
+
+    def ensure_partitions(self, start: datetime, end: datetime):
+        """Verilen aralığı kapsayan günlük partition'ları oluştur (tablo partitioned değilse atlanır)"""
+        if not self.is_partitioned():
+            logger.debug(f"{self.table} partitioned değil, partition oluşturma atlandı")
+            return
+
+        day = start.astimezone(dt_timezone.utc).date()
+        last_day = end.astimezone(dt_timezone.utc).date()
+
+        with connection.cursor() as cursor:
+            while day <= last_day:
+                next_day = day + timedelta(days=1)
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{self.partition_name(day)}" '
+                    f'PARTITION OF "{self.table}" '
+                    f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') TO ('{next_day.isoformat()} 00:00:00+00')"
+                )
+                day = next_day
+
+    def list_partitions(self) -> List[str]:
+        """Mevcut partition tablolarını listele"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = %s ORDER BY child.relname",
+                [self.table]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def drop_expired_partitions(self, retention_days: int = None) -> List[str]:
+        """
+        Saklama süresini aşan partition'ları DROP ile sil (satır bazlı DELETE yok).
+
+        Tablo henüz dönüştürülmemişse eski satırlar batch'ler halinde silinir.
+        Her iki durumda da artık log'u kalmayan uygulamalar listeden çıkarılır.
+        """
+        retention_days = retention_days or self.retention_days
+        cutoff_time = timezone.now() - timedelta(days=retention_days)
+        cutoff = cutoff_time.astimezone(dt_timezone.utc).date()
+        dropped = []
+
+        if not self.is_partitioned():
+            from authentication.services import ChunkedDeleteService
+            deleted = ChunkedDeleteService(ObservabilityLog, 'timestamp').delete_before(cutoff_time)['deleted']
+            logger.info(f"{self.table} partitioned değil, {deleted} eski kayıt silindi")
+            self._prune_applications(cutoff_time)
+            return dropped
+
+        with connection.cursor() as cursor:
+            for name in self.list_partitions():
+                match = PARTITION_SUFFIX.search(name)
+                if not match:
+                    continue
+                day = datetime.strptime(match.group(1), '%Y%m%d').date()
+                if day < cutoff:
+                    cursor.execute(f'DROP TABLE IF EXISTS "{name}"')
+                    dropped.append(name)
+
+        if dropped:
+            logger.info(f"Observability log partition'ları silindi: {', '.join(dropped)}")
+        self._prune_applications(datetime.combine(cutoff, datetime.min.time(), tzinfo=dt_timezone.utc))
+        return dropped
+
+    def _prune_applications(self, cutoff: datetime) -> int:
+        """Son log'u saklama süresinden eski olan uygulamaları sil"""
+        deleted, _ = ObservabilityApplication.objects.filter(last_seen__lt=cutoff).delete()
+        return deleted
+
+    def convert_to_partitioned(self):
+        """Mevcut düz tabloyu timestamp üzerinden range-partitioned tabloya dönüştür"""
+        legacy = f"{self.table}_legacy"
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relkind FROM pg_class WHERE relname = %s", [self.table]
+            )
+            row = cursor.fetchone()
+            if row and row[0] == 'p':
+                logger.info(f"{self.table} zaten partitioned")
+                return False
+
+            cursor.execute(f'ALTER TABLE "{self.table}" RENAME TO "{legacy}"')
+            # İsimler yeni tabloda kullanılacağı için eski tablodaki kısıt ve index'leri kaldır
+            cursor.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT IF EXISTS "{self.table}_pkey"')
+            cursor.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT IF EXISTS "obslog_ts_fingerprint_uniq"')
+            indexes = self._index_definitions()
+            for name in indexes:
+                cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+            cursor.execute(
+                f'CREATE TABLE "{self.table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING IDENTITY) '
+                f'PARTITION BY RANGE ("timestamp")'
+            )
+            # Partition anahtarı birincil anahtar ve unique kısıtlara dahil olmalı
+            cursor.execute(f'ALTER TABLE "{self.table}" ADD PRIMARY KEY ("id", "timestamp")')
+            cursor.execute(
+                f'ALTER TABLE "{self.table}" ADD CONSTRAINT "obslog_ts_fingerprint_uniq" '
+                f'UNIQUE ("timestamp", "fingerprint")'
+            )
+            cursor.execute(f'CREATE TABLE "{self.table}_default" PARTITION OF "{self.table}" DEFAULT')
+
+            for name, columns in indexes.items():
+                cursor.execute(f'CREATE INDEX "{name}" ON "{self.table}" ({columns})')
+
+            # Eski kayıtlar DEFAULT yerine günlük partition'lara düşsün
+            cursor.execute(f'SELECT MIN("timestamp"), MAX("timestamp") FROM "{legacy}"')
+            oldest, newest = cursor.fetchone()
+            if oldest and newest:
+                self.ensure_partitions(oldest, newest)
+
+            cursor.execute(f'INSERT INTO "{self.table}" SELECT * FROM "{legacy}" ON CONFLICT DO NOTHING')
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('\"{self.table}\"', 'id'), "
+                f'COALESCE((SELECT MAX("id") FROM "{self.table}"), 1))'
+            )
+            cursor.execute(f'DROP TABLE "{legacy}"')
+
+        logger.info(f"{self.table} partitioned tabloya dönüştürüldü")
+        return True
@@ -0,0 +1,113 @@
+import bisect
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+EMPTY_SUMMARY = {
+    'current': 0,
+    'average': 0,
+    'min': 0,
+    'max': 0,
+    'p50': 0,
+    'p95': 0,
+    'p99': 0,
+    'count': 0,
+}
+
+def to_array(values: Sequence) -> np.ndarray:
+    """Değer listesini float dizisine çevir (None -> NaN)"""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+def summarize(values, precision: int = 2) -> Dict:
+    """Ortalama, min, max ve yüzdelikleri tek geçişte hesapla"""
+    array = values if isinstance(values, np.ndarray) else to_array(values)
+    array = array[~np.isnan(array)]
+
+    if array.size == 0:
+        return dict(EMPTY_SUMMARY)
+
+    p50, p95, p99 = np.percentile(array, [50, 95, 99])
+
+    return {
+        'current': round(float(array[-1]), precision),
+        'average': round(float(array.mean()), precision),
+        'min': round(float(array.min()), precision),
+        'max': round(float(array.max()), precision),
+        'p50': round(float(p50), precision),
+        'p95': round(float(p95), precision),
+        'p99': round(float(p99), precision),
+        'count': int(array.size),
+    }
+
+def rate(values, timestamps) -> np.ndarray:
+    """Sayaç değerlerinden saniye başına artış oranı hesapla (timestamps: ms)"""
+    values = values if isinstance(values, np.ndarray) else to_array(values)
+    timestamps = np.asarray(timestamps, dtype=float)
+
+    if values.size < 2:
+        return np.array([], dtype=float)
+
+    elapsed = np.diff(timestamps) / 1000.0
+    delta = np.diff(values)
+    # Sayaç sıfırlanmalarını (negatif fark) ve sıfır aralıkları yok say
+    delta[delta < 0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(elapsed > 0, delta / elapsed, np.nan)
+
+def downsample(timestamps, values, max_points: int) -> Tuple[List, List]:
+    """Seriyi en fazla max_points kovaya indir (kova ortalaması)"""
+    values = values if isinstance(values, np.ndarray) else to_array(values)
+    timestamps = np.asarray(timestamps)
+
+    if max_points <= 0 or values.size <= max_points:
+        return timestamps.tolist(), values.tolist()
+
+    edges = np.linspace(0, values.size, max_points + 1, dtype=int)
+    counts = np.diff(edges)
+    sums = np.add.reduceat(np.nan_to_num(values), edges[:-1])
+    valid = np.add.reduceat(~np.isnan(values), edges[:-1])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(valid > 0, sums / valid, np.nan)
+
+    # Her kovanın son zaman damgasını temsilci olarak kullan
+    bucket_timestamps = timestamps[edges[:-1] + counts - 1]
+    return bucket_timestamps.tolist(), means.tolist()
+
+def summarize_series(timestamps: List, values: List, max_points: Optional[int] = None) -> Dict:
+    """Seri verisini özet istatistiklerle birlikte döndür"""
+    array = to_array(values)
+    result = {'values': values, 'timestamps': timestamps}
+    result.update(summarize(array))
+
+    if max_points:
+        result['timestamps'], result['values'] = downsample(timestamps, array, max_points)
+
+    return result
+
+def merge_series(series: Optional[Dict], timestamps: List, values: List, window_start) -> Dict:
+    """
+    Yeni noktaları seriye ekle, pencere dışında kalan başı kırp.
+
+    Son kova kısmi olabileceğinden ilk yeni zaman damgası ve sonrası eski
+    seriden çıkarılır. Artımlı olan yalnızca API'den çekilen aralıktır;
+    istatistikler summarize_series ile pencerenin tamamı üzerinden yeniden
+    hesaplanır (tek vektörel geçiş, çalışan toplamdaki kayma birikmez).
+    """
+    if not series:
+        keep = bisect.bisect_left(timestamps, window_start)
+        return {
+            'timestamps': list(timestamps[keep:]),
+            'values': list(values[keep:]),
+        }
+
+    old_timestamps = series['timestamps']
+    old_values = series['values']
+
+    cut = bisect.bisect_left(old_timestamps, timestamps[0]) if timestamps else len(old_timestamps)
+    head = bisect.bisect_left(old_timestamps, window_start, 0, cut)
+    new_start = bisect.bisect_left(timestamps, window_start)
+
+    return {
+        'timestamps': old_timestamps[head:cut] + list(timestamps[new_start:]),
+        'values': old_values[head:cut] + list(values[new_start:]),
+    }
@@ -0,0 +1,344 @@
+import requests
+import json
+from datetime import datetime, timedelta
+from django.utils import timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from ..models import MetricSource, MetricDefinition, MetricSeries, MetricData, Alert
+from .event_stream import publish_event
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MetricCollector:
+    """Metrik toplama servisi"""
+    
+    def __init__(self, source):
+        self.source = source
+        self.session = requests.Session()
+        self._setup_authentication()
+    
+    def _setup_authentication(self):
+        """Kimlik doğrulama ayarları"""
+        if self.source.api_key:
+            self.session.headers.update({'Authorization': f'Bearer {self.source.api_key}'})
+        elif self.source.username and self.source.password:
+            self.session.auth = (self.source.username, self.source.password)
+        
+        if self.source.headers:
+            self.session.headers.update(self.source.headers)
+    
+    def collect_metric(self, metric_definition):
+        """Tek bir metrik topla"""
+        try:
+            if self.source.source_type == 'prometheus':
+                return self._collect_prometheus_metric(metric_definition)
+            elif self.source.source_type == 'grafana':
+                return self._collect_grafana_metric(metric_definition)
+            elif self.source.source_type == 'custom_api':
+                return self._collect_custom_api_metric(metric_definition)
+            else:
+                logger.warning(f"Desteklenmeyen kaynak tipi: {self.source.source_type}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Metrik toplama hatası ({metric_definition.name}): {str(e)}")
+            return None
+    
+    def _collect_prometheus_metric(self, metric_definition):
+        """Prometheus'tan metrik topla"""
+        url = f"{self.source.base_url}/api/v1/query"
+        params = {
+            'query': metric_definition.query,
+            'time': timezone.now().timestamp()
+        }
+        
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        
+        data = response.json()
+        if data['status'] == 'success' and data['data']['result']:
+            result = data['data']['result'][0]
+            value = float(result['value'][1])
+            labels = result.get('metric', {})
+            
+            return {
+                'value': value,
+                'labels': labels,
+                'timestamp': timezone.now()
+            }
+        
+        return None
+    
+    def _collect_grafana_metric(self, metric_definition):
+        """Grafana'dan metrik topla"""
+        # Grafana API implementasyonu
+        # Bu örnekte basit bir implementasyon
+        url = f"{self.source.base_url}/api/datasources/proxy/1/api/v1/query"
+        params = {'query': metric_definition.query}
+        
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        
+        # Grafana response parsing logic burada olacak
+        return None
+    
+    def _collect_custom_api_metric(self, metric_definition):
+        """Özel API'dan metrik topla"""
+        url = f"{self.source.base_url}/{metric_definition.query}"
+        
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        # Özel API response parsing logic
+        if 'value' in data:
+            return {
+                'value': float(data['value']),
+                'labels': data.get('labels', {}),
+                'timestamp': timezone.now()
+            }
+        
+        return None
+
+class AlertManager:
+    """
+    Uyarı yönetim servisi - durum makinesi, yalnızca geçişlerde DB'ye yazar.
+    
+    Metriğin durumu açık uyarısından okunur; geçişler metrik satırı
+    select_for_update ile kilitlenerek yapılır, böylece aynı ihlal için
+    birden çok worker yinelenen uyarı oluşturmaz. Bekleyen geçiş (minimum
+    süre) paylaşılan cache'te tutulur.
+    """
+    
+    OPEN_STATUSES = ['active', 'acknowledged']
+    PENDING_TTL = 3600
+    
+    @staticmethod
+    def _pending_key(metric_definition):
+        return f"perf_alert_pending:{metric_definition.pk}"
+    
+    @classmethod
+    def current_state(cls, metric_definition):
+        """Açık uyarıdan metriğin durumunu döndür: (durum, alert_id)"""
+        alert = Alert.objects.filter(
+            metric=metric_definition,
+            status__in=cls.OPEN_STATUSES,
+            severity__in=['warning', 'critical']
+        ).order_by('-triggered_at').values_list('id', 'severity').first()
+        
+        if alert is None:
+            return 'ok', None
+        return alert[1], alert[0]
+    
+    @staticmethod
+    def _target_state(metric_definition, current_value, current_state):
+        """Histerezis ile hedef durumu hesapla"""
+        hysteresis = getattr(settings, 'PERFORMANCE_ALERT_HYSTERESIS', 0.05)
+        
+        def breached(threshold, held):
+            if threshold is None:
+                return False
+            # Eşik aşılmış durumdaysa, temizlenmesi için eşiğin histerezis kadar altına inmeli
+            if held:
+                return current_value >= threshold - abs(threshold) * hysteresis
+            return current_value >= threshold
+        
+        if breached(metric_definition.threshold_critical, current_state == 'critical'):
+            return 'critical'
+        if breached(metric_definition.threshold_warning, current_state in ('warning', 'critical')):
+            return 'warning'
+        return 'ok'
+    
+    @classmethod
+    def check_thresholds(cls, metric_definition, current_value):
+        """Eşik değerlerini kontrol et, durum değişiminde uyarı oluştur/çöz"""
+        state, _ = cls.current_state(metric_definition)
+        target = cls._target_state(metric_definition, current_value, state)
+        pending_key = cls._pending_key(metric_definition)
+        
+        if target == state:
+            cache.delete(pending_key)
+            return []
+        
+        now = timezone.now()
+        pending = cache.get(pending_key)
+        if pending is None or pending[0] != target:
+            pending = (target, now)
+            cache.set(pending_key, pending, cls.PENDING_TTL)
+        
+        # Geçişin kalıcı olması için minimum süre bekle
+        min_duration = getattr(settings, 'PERFORMANCE_ALERT_MIN_DURATION', 120)
+        if (now - pending[1]).total_seconds() < min_duration:
+            return []
+        
+        return cls._transition(metric_definition, target, current_value)
+    
+    @classmethod
+    def _transition(cls, metric_definition, target, current_value):
+        """Durum geçişini metrik satırı kilitliyken uygula"""
+        alerts_created = []
+        
+        with transaction.atomic():
+            MetricDefinition.objects.select_for_update().get(pk=metric_definition.pk)
+            
+            # Kilit beklenirken başka bir worker geçişi yapmış olabilir
+            state, alert_id = cls.current_state(metric_definition)
+            if cls._target_state(metric_definition, current_value, state) != target:
+                return []
+            
+            if alert_id:
+                cls.resolve_alerts(metric_definition)
+            
+            if target == 'critical':
+                alert = Alert.objects.create(
+                    metric=metric_definition,
+                    title=f"{metric_definition.name} - Kritik Eşik Aşıldı",
+                    description=f"Mevcut değer ({current_value}) kritik eşiği ({metric_definition.threshold_critical}) aştı.",
+                    severity='critical',
+                    threshold_value=metric_definition.threshold_critical,
+                    current_value=current_value
+                )
+                alerts_created.append(alert)
+            
+            elif target == 'warning':
+                alert = Alert.objects.create(
+                    metric=metric_definition,
+                    title=f"{metric_definition.name} - Uyarı Eşiği Aşıldı",
+                    description=f"Mevcut değer ({current_value}) uyarı eşiğini ({metric_definition.threshold_warning}) aştı.",
+                    severity='warning',
+                    threshold_value=metric_definition.threshold_warning,
+                    current_value=current_value
+                )
+                alerts_created.append(alert)
+            
+            event = {
+                'metric_id': metric_definition.pk,
+                'metric': metric_definition.name,
+                'previous_state': state,
+                'state': target,
+                'alert_id': alerts_created[0].id if alerts_created else None,
+                'value': current_value,
+            }
+            transaction.on_commit(
+                lambda: publish_event(metric_definition.technology.technology, 'alert', event)
+            )
+        
+        cache.delete(cls._pending_key(metric_definition))
+        logger.info(f"Uyarı durumu değişti: {metric_definition.name} {state} -> {target}")
+        
+        return alerts_created
+    
+    @staticmethod
+    def resolve_alerts(metric_definition, alert_ids=None):
+        """Açık uyarıları tek sorguda çöz"""
+        open_alerts = Alert.objects.filter(
+            metric=metric_definition,
+            status__in=AlertManager.OPEN_STATUSES
+        )
+        
+        if alert_ids is not None:
+            open_alerts = open_alerts.filter(id__in=alert_ids)
+        
+        now = timezone.now()
+        return open_alerts.update(status='resolved', resolved_at=now, updated_at=now)
+
+class PerformanceService:
+    """Ana performans servisi"""
+    
+    @staticmethod
+    def collect_all_metrics():
+        """Tüm metrikleri topla"""
+        collected_count = 0
+        error_count = 0
+        
+        for source in MetricSource.objects.filter(is_active=True):
+            collector = MetricCollector(source)
+            
+            for metric in MetricDefinition.objects.filter(source=source, is_active=True).select_related('technology'):
+                try:
+                    data = collector.collect_metric(metric)
+                    
+                    if data:
+                        # Metrik verisini kaydet (etiketler seri sözlüğünde tutulur)
+                        series = MetricSeries.objects.get_for_labels(metric, data['labels'])
+                        MetricData.objects.create(
+                            series=series,
+                            timestamp=data['timestamp'],
+                            value=data['value']
+                        )
+                        
+                        # Canlı akışa yalnızca yeni noktayı gönder
+                        publish_event(metric.technology.technology, 'metric', {
+                            'metric_id': metric.pk,
+                            'metric': metric.name,
+                            'series_id': series.pk,
+                            'timestamp': data['timestamp'],
+                            'value': data['value'],
+                        })
+                        
+                        # Eski verileri temizle (30 gün)
+                        cutoff_date = timezone.now() - timedelta(days=30)
+                        MetricData.objects.filter(
+                            series__metric=metric,
+                            timestamp__lt=cutoff_date
+                        ).delete()
+                        
+                        # Uyarı kontrolü (yalnızca durum geçişlerinde yazar)
+                        AlertManager.check_thresholds(metric, data['value'])
+                        
+                        collected_count += 1
+                        logger.info(f"Metrik toplandı: {metric.name} = {data['value']}")
+                    
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"Metrik toplama hatası ({metric.name}): {str(e)}")
+        
+        return {
+            'collected': collected_count,
+            'errors': error_count
+        }
+    
+    @staticmethod
+    def get_metric_data(metric_id, time_range='1h', labels=None):
+        """Metrik verilerini getir"""
+        try:
+            metric = MetricDefinition.objects.get(id=metric_id)
+            
+            # Zaman aralığını hesapla
+            time_ranges = {
+                '1h': timedelta(hours=1),
+                '6h': timedelta(hours=6),
+                '24h': timedelta(hours=24),
+                '7d': timedelta(days=7),
+                '30d': timedelta(days=30),
+            }
+            
+            start_time = timezone.now() - time_ranges.get(time_range, timedelta(hours=1))
+            
+            # Etiket filtresi seri tablosunda çözülür, örnekler seri id ile okunur
+            series_labels = dict(
+                MetricSeries.objects.matching(metric, **(labels or {})).values_list('id', 'labels')
+            )
+            
+            data = MetricData.objects.filter(
+                series_id__in=list(series_labels),
+                timestamp__gte=start_time
+            ).order_by('timestamp').values_list('series_id', 'timestamp', 'value')
+            
+            return {
+                'metric': metric,
+                'data': [
+                    {
+                        'timestamp': timestamp.isoformat(),
+                        'value': value,
+                        'labels': series_labels[series_id]
+                    }
+                    for series_id, timestamp, value in data
+                ]
+            }
+            
+        except MetricDefinition.DoesNotExist:
+            return None
@@ -1,12 +1,15 @@
 import asyncio
 import concurrent.futures
+import heapq
+from operator import itemgetter
 from typing import Dict, List, Any
-from django.core.cache import cache
 from django.utils import timezone
 from .dynatrace import DynatraceService
 from .splunk_service import SplunkService
 from .kibana_service import KibanaService
 from .instana_service import InstanaService
+from .log_persistence import parse_log_timestamp
+from .swr_cache import get_or_refresh
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +23,7 @@ class ObservabilityService:
         self.kibana = KibanaService()
         self.instana = InstanaService()
     
-    def get_unified_error_logs(self, application_name: str = None, time_range: str = '24h') -> Dict:
+    def get_unified_error_logs(self, application_name: str = None, time_range: str = '24h', limit: int = None) -> Dict:
         """Tüm platformlardan hata loglarını birleşik olarak getir"""
         cache_key = f"unified_errors_{application_name or 'all'}_{time_range}"
         
@@ -62,34 +65,32 @@ class ObservabilityService:
                 except Exception as e:
                     logger.error(f"Instana error logs fetch failed: {str(e)}")
             
-            # Tüm logları birleştir
-            all_logs = (
-                results['splunk_logs'] + 
-                results['kibana_logs'] + 
-                results['instana_logs']
+            # Sıralı platform akışlarını birleştir, özeti aynı geçişte hesapla
+            results['all_logs'], results['summary'] = self._merge_logs(
+                [results['splunk_logs'], results['kibana_logs'], results['instana_logs']]
             )
             
-            # Zaman sırasına göre sırala
-            all_logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            results['all_logs'] = all_logs
-            
-            # Özet istatistikleri hesapla
-            results['summary'] = self._calculate_log_summary(all_logs)
-            
             return results
         
-        return cache.get_or_set(cache_key, fetch_unified_logs, 300)
+        # Cache'te tam sonuç tutulur; limit okunduktan sonra uygulanır
+        results = get_or_refresh(cache_key, fetch_unified_logs, 300)
+        all_logs = results['all_logs'][:limit] if limit else results['all_logs']
+        return {
+            **results,
+            'all_logs': all_logs,
+            'summary': {**results['summary'], 'returned_logs': len(all_logs)}
+        }
     
-    def get_unified_dashboard_summary(self, time_range: str = '24h') -> Dict:
+    def get_unified_dashboard_summary(self, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Tüm platformlardan dashboard özet bilgilerini getir"""
         cache_key = f"unified_dashboard_summary_{time_range}"
         
         def fetch_unified_summary():
             with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
                 # Future'ları başlat
-                splunk_future = executor.submit(self.splunk.get_dashboard_summary, time_range)
-                kibana_future = executor.submit(self.kibana.get_dashboard_summary, time_range)
-                instana_future = executor.submit(self.instana.get_dashboard_summary, time_range)
+                splunk_future = executor.submit(self.splunk.get_dashboard_summary, time_range, refresh)
+                kibana_future = executor.submit(self.kibana.get_dashboard_summary, time_range, refresh)
+                instana_future = executor.submit(self.instana.get_dashboard_summary, time_range, refresh)
                 
                 # Sonuçları topla
                 summaries = {}
@@ -156,18 +157,18 @@ class ObservabilityService:
             
             return unified_summary
         
-        return cache.get_or_set(cache_key, fetch_unified_summary, 300)
+        return get_or_refresh(cache_key, fetch_unified_summary, 300, refresh=refresh)
     
-    def get_application_health_score(self, application_name: str, time_range: str = '24h') -> Dict:
+    def get_application_health_score(self, application_name: str, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Uygulama sağlık skoru hesapla"""
         cache_key = f"app_health_{application_name}_{time_range}"
         
         def calculate_health_score():
             # Tüm platformlardan metrik al
             with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                splunk_future = executor.submit(self.splunk.get_application_metrics, application_name, time_range)
-                kibana_future = executor.submit(self.kibana.get_application_metrics, application_name, time_range)
-                instana_future = executor.submit(self.instana.get_application_metrics, application_name, time_range)
+                splunk_future = executor.submit(self.splunk.get_application_metrics, application_name, time_range, refresh)
+                kibana_future = executor.submit(self.kibana.get_application_metrics, application_name, time_range, refresh)
+                instana_future = executor.submit(self.instana.get_application_metrics, application_name, time_range, refresh)
                 
                 metrics = {}
                 try:
@@ -256,19 +257,39 @@ class ObservabilityService:
                 'platform_metrics': metrics
             }
         
-        return cache.get_or_set(cache_key, calculate_health_score, 300)
+        return get_or_refresh(cache_key, calculate_health_score, 300, refresh=refresh)
+    
+    def _epoch_stream(self, logs: List[Dict]) -> List:
+        """Logları (epoch, log) çiftlerine çevir, yeni -> eski sıralı olduğundan emin ol"""
+        stream = []
+        for log in logs:
+            parsed = parse_log_timestamp(log.get('timestamp'))
+            epoch = parsed.timestamp() if parsed else 0.0
+            stream.append((epoch, log))
+        
+        # Platformlar genellikle sıralı döner; değilse yalnızca o akışı sırala
+        if any(stream[i][0] < stream[i + 1][0] for i in range(len(stream) - 1)):
+            stream.sort(key=itemgetter(0), reverse=True)
+        
+        return stream
     
-    def _calculate_log_summary(self, logs: List[Dict]) -> Dict:
-        """Log özet istatistiklerini hesapla"""
+    def _merge_logs(self, platform_logs: List[List[Dict]]):
+        """Platform akışlarını heapq.merge ile birleştir ve özeti tek geçişte hesapla"""
+        streams = [self._epoch_stream(logs) for logs in platform_logs]
+        
         summary = {
-            'total_logs': len(logs),
+            'total_logs': sum(len(stream) for stream in streams),
             'by_platform': {},
             'by_level': {},
             'by_application': {},
             'timeline': []
         }
+        timeline = {}
+        merged = []
         
-        for log in logs:
+        for epoch, log in heapq.merge(*streams, key=itemgetter(0), reverse=True):
+            merged.append(log)
+            
             # Platform bazlı sayım
             platform = log.get('source_platform', 'unknown')
             summary['by_platform'][platform] = summary['by_platform'].get(platform, 0) + 1
@@ -280,8 +301,18 @@ class ObservabilityService:
             # Uygulama bazlı sayım
             app = log.get('application_name', 'Unknown')
             summary['by_application'][app] = summary['by_application'].get(app, 0) + 1
+            
+            # Saatlik zaman çizelgesi
+            if epoch:
+                bucket = int(epoch // 3600 * 3600)
+                timeline[bucket] = timeline.get(bucket, 0) + 1
+        
+        summary['timeline'] = [
+            {'timestamp': bucket, 'count': count}
+            for bucket, count in sorted(timeline.items())
+        ]
         
-        return summary
+        return merged, summary
     
     def _merge_top_applications(self, summaries: Dict) -> List[Dict]:
         """Farklı platformlardan gelen top application listelerini birleştir"""
@@ -3,6 +3,7 @@ import json
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.cache import cache
+from .swr_cache import get_or_refresh
 from django.utils import timezone
 from typing import Dict, List, Optional
 import logging
@@ -174,9 +175,9 @@ class SplunkService:
             
             return logs
         
-        return cache.get_or_set(cache_key, fetch_error_logs, 300)
+        return get_or_refresh(cache_key, fetch_error_logs, 300)
     
-    def get_application_metrics(self, application_name: str, time_range: str = '24h') -> Dict:
+    def get_application_metrics(self, application_name: str, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Uygulama metriklerini getir"""
         cache_key = f"splunk_metrics_{application_name}_{time_range}"
         
@@ -207,9 +208,9 @@ class SplunkService:
             
             return metrics
         
-        return cache.get_or_set(cache_key, fetch_metrics, 300)
+        return get_or_refresh(cache_key, fetch_metrics, 300, refresh=refresh)
     
-    def get_dashboard_summary(self, time_range: str = '24h') -> Dict:
+    def get_dashboard_summary(self, time_range: str = '24h', refresh: bool = False) -> Dict:
         """Dashboard özet bilgilerini getir"""
         cache_key = f"splunk_dashboard_summary_{time_range}"
         
@@ -248,4 +249,4 @@ class SplunkService:
             
             return summary
         
-        return cache.get_or_set(cache_key, fetch_summary, 300)
+        return get_or_refresh(cache_key, fetch_summary, 300, refresh=refresh)
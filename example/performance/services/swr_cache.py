@@ -0,0 +1,146 @@
+import concurrent.futures
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from typing import Callable, Dict, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATS_PREFIX = 'swr_stats'
+STAT_KINDS = ('hit', 'miss', 'stale')
+
+_executor = None
+_executor_lock = threading.Lock()
+_known_prefixes = set()
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Arka plan yenilemeleri için paylaşılan thread havuzu"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=getattr(settings, 'OBSERVABILITY_CACHE_REFRESH_WORKERS', 4),
+                thread_name_prefix='swr-refresh'
+            )
+        return _executor
+
+def key_prefix(cache_key: str) -> str:
+    """İstatistikler için anahtar öneki (ör. splunk_errors, unified_dashboard)"""
+    return '_'.join(cache_key.split('_')[:2])
+
+def _record(cache_key: str, kind: str):
+    """Önek bazlı hit/miss/stale sayacını artır"""
+    prefix = key_prefix(cache_key)
+    stat_key = f"{STATS_PREFIX}:{prefix}:{kind}"
+    try:
+        if not cache.add(stat_key, 1, None):
+            cache.incr(stat_key)
+        if prefix not in _known_prefixes:
+            _known_prefixes.add(prefix)
+            prefixes = set(cache.get(f"{STATS_PREFIX}:prefixes") or [])
+            if prefix not in prefixes:
+                prefixes.add(prefix)
+                cache.set(f"{STATS_PREFIX}:prefixes", sorted(prefixes), None)
+    except Exception as e:
+        logger.debug(f"Cache istatistiği yazılamadı ({stat_key}): {str(e)}")
+
+def get_cache_stats(prefixes: Iterable[str] = None) -> Dict[str, Dict[str, int]]:
+    """Önek bazlı hit/miss/stale sayaçlarını döndür"""
+    prefixes = prefixes or cache.get(f"{STATS_PREFIX}:prefixes") or []
+    keys = [f"{STATS_PREFIX}:{prefix}:{kind}" for prefix in prefixes for kind in STAT_KINDS]
+    values = cache.get_many(keys)
+
+    return {
+        prefix: {kind: values.get(f"{STATS_PREFIX}:{prefix}:{kind}", 0) for kind in STAT_KINDS}
+        for prefix in prefixes
+    }
+
+def _unwrap(entry):
+    """(veri, taze kalma zamanı); zarfsız eski formattaki değerler bayat kabul edilir"""
+    if isinstance(entry, dict) and 'fresh_until' in entry and 'data' in entry:
+        return entry['data'], entry['fresh_until']
+    return entry, 0
+
+def _store(cache_key: str, data, soft_ttl: int, hard_ttl: int):
+    cache.set(cache_key, {'data': data, 'fresh_until': time.time() + soft_ttl}, hard_ttl)
+
+def _refresh(cache_key: str, fetch_func: Callable, soft_ttl: int, hard_ttl: int, lock_key: str):
+    """Veriyi yeniden çek ve kilidi bırak"""
+    try:
+        _store(cache_key, fetch_func(), soft_ttl, hard_ttl)
+    except Exception as e:
+        logger.error(f"Cache yenileme hatası ({cache_key}): {str(e)}")
+    finally:
+        cache.delete(lock_key)
+        close_old_connections()
+
+def get_or_refresh(cache_key: str, fetch_func: Callable, soft_ttl: int, hard_ttl: int = None, refresh: bool = False):
+    """
+    Stale-while-revalidate cache.get_or_set karşılığı.
+
+    soft_ttl dolana kadar veri taze kabul edilir. soft_ttl ile hard_ttl arasında
+    eski veri hemen döndürülür ve tek bir arka plan yenilemesi (cache kilidi ile)
+    başlatılır. Soğuk miss durumunda yalnızca kilidi alan istek veriyi çeker,
+    diğerleri kısa süre sonucu bekler. refresh=True (ön ısıtma) tazeliği bir
+    sonraki ön ısıtma turundan önce bitecek kaydı süresi dolmadan yeniden çeker.
+    """
+    hard_ttl = hard_ttl or soft_ttl * getattr(settings, 'OBSERVABILITY_CACHE_STALE_FACTOR', 4)
+    lock_key = f"{cache_key}:refresh_lock"
+    lock_timeout = getattr(settings, 'OBSERVABILITY_CACHE_LOCK_TIMEOUT', 90)
+
+    entry = cache.get(cache_key)
+
+    if refresh:
+        window = getattr(settings, 'PERFORMANCE_PREWARM_INTERVAL', 90)
+        if entry is not None:
+            data, fresh_until = _unwrap(entry)
+            if fresh_until - time.time() > window:
+                # Bir sonraki turda hâlâ taze olacak, yeniden çekmeye gerek yok
+                return data
+
+        if cache.add(lock_key, 1, lock_timeout):
+            try:
+                data = fetch_func()
+                _store(cache_key, data, soft_ttl, hard_ttl)
+                return data
+            finally:
+                cache.delete(lock_key)
+
+        if entry is not None:
+            # Başka bir işlem zaten yeniliyor
+            return data
+        # Soğuk anahtar ve kilit başkasında: normal yolla sonucu bekle
+
+    if entry is not None:
+        data, fresh_until = _unwrap(entry)
+        if time.time() < fresh_until:
+            _record(cache_key, 'hit')
+            return data
+
+        _record(cache_key, 'stale')
+        if cache.add(lock_key, 1, lock_timeout):
+            _get_executor().submit(_refresh, cache_key, fetch_func, soft_ttl, hard_ttl, lock_key)
+        return data
+
+    _record(cache_key, 'miss')
+
+    if not cache.add(lock_key, 1, lock_timeout):
+        # Başka bir istek zaten çekiyor, sonucunu bekle
+        wait_limit = getattr(settings, 'OBSERVABILITY_CACHE_MISS_WAIT', 30)
+        deadline = time.time() + wait_limit
+        while time.time() < deadline:
+            time.sleep(0.25)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return _unwrap(entry)[0]
+        return fetch_func()
+
+    try:
+        data = fetch_func()
+        _store(cache_key, data, soft_ttl, hard_ttl)
+        return data
+    finally:
+        cache.delete(lock_key)
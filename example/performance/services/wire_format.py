@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COMPACT_CONTENT_TYPE = 'application/vnd.portal.compact+json'
+
+def wants_compact(request) -> bool:
+    """İstemci sıkıştırılmış formatı Accept header'ı veya ?format=compact ile ister"""
+    return (
+        request.GET.get('format') == 'compact' or
+        COMPACT_CONTENT_TYPE in request.headers.get('Accept', '')
+    )
+
+def to_epoch_ms(value) -> int:
+    """ms, datetime veya ISO string zaman damgasını epoch milisaniyeye çevir"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return 0
+
+def encode_timestamps(timestamps: List) -> Dict:
+    """Zaman damgalarını başlangıç + delta dizisi olarak kodla"""
+    epochs = [to_epoch_ms(ts) for ts in timestamps]
+    if not epochs:
+        return {'t0': 0, 'dt': []}
+    return {
+        't0': epochs[0],
+        'dt': [current - previous for previous, current in zip(epochs, epochs[1:])],
+    }
+
+def compact_series(data: Any) -> Any:
+    """timestamps/values içeren her sözlüğü sıkıştırılmış forma çevir"""
+    if isinstance(data, dict):
+        if 'timestamps' in data and 'values' in data:
+            encoded = {key: value for key, value in data.items() if key not in ('timestamps', 'values')}
+            encoded.update(encode_timestamps(data['timestamps']))
+            encoded['v'] = data['values']
+            return encoded
+        return {key: compact_series(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [compact_series(item) for item in data]
+    return data
+
+def compact_response(payload: Dict, status: int = 200) -> HttpResponse:
+    """Sıkıştırılmış yanıtı orjson (varsa) ile serileştir"""
+    payload = compact_series(payload)
+
+    if orjson is not None:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, separators=(',', ':'), default=str)
+
+    response = HttpResponse(body, content_type=COMPACT_CONTENT_TYPE, status=status)
+    response['Vary'] = 'Accept'
+    return response
@@ -0,0 +1,115 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+import concurrent.futures
+from .models import TechnologyDashboard, ObservabilityApplication
+from .services import PerformanceService
+from .services.dynatrace import DynatraceService
+from .services.observability_service import ObservabilityService
+from .services.log_persistence import LogPersistenceService
+import logging
+
+logger = logging.getLogger(__name__)
+
+@shared_task
+def collect_metrics():
+    """Aktif kaynaklardan metrikleri topla; yeni noktalar ve uyarı geçişleri canlı akışa yayınlanır"""
+    lock_key = 'performance_collect_metrics_lock'
+    if not cache.add(lock_key, 1, getattr(settings, 'PERFORMANCE_COLLECT_LOCK_TIMEOUT', 300)):
+        return 'Metrik toplama zaten çalışıyor'
+    
+    try:
+        result = PerformanceService.collect_all_metrics()
+        logger.info(f"Metric collection completed: {result['collected']} collected, {result['errors']} errors")
+        return result
+    finally:
+        cache.delete(lock_key)
+
+@shared_task
+def ingest_observability_logs(time_range='1h'):
+    """Platformlardan gelen normalize logları ObservabilityLog tablosuna toplu yaz"""
+    try:
+        logs_data = ObservabilityService().get_unified_error_logs(None, time_range)
+        created = LogPersistenceService().ingest(logs_data.get('all_logs', []))
+        
+        return {
+            'status': 'success',
+            'ingested': created,
+            'timestamp': timezone.now().isoformat()
+        }
+        
+    except Exception as exc:
+        logger.error(f"Observability log ingest failed: {str(exc)}")
+        return {
+            'status': 'failed',
+            'error': str(exc),
+            'timestamp': timezone.now().isoformat()
+        }
+
+@shared_task
+def maintain_observability_log_partitions(days_ahead=3):
+    """Gelecek günlerin partition'larını oluştur, süresi dolanları DROP et"""
+    service = LogPersistenceService()
+    now = timezone.now()
+    
+    service.ensure_partitions(now, now + timedelta(days=days_ahead))
+    dropped = service.drop_expired_partitions()
+    
+    return f"Silinen partition sayısı: {len(dropped)}"
+
+@shared_task(queue='prewarm')
+def prewarm_dashboards():
+    """Teknoloji ve observability dashboard cache'lerini TTL dolmadan yenile"""
+    lock_key = 'performance_prewarm_lock'
+    if not cache.add(lock_key, 1, getattr(settings, 'PERFORMANCE_PREWARM_LOCK_TIMEOUT', 600)):
+        return 'Ön ısıtma zaten çalışıyor'
+    
+    try:
+        time_ranges = getattr(settings, 'PERFORMANCE_PREWARM_TIME_RANGES', ['1h', '6h', '24h'])
+        dynatrace_service = DynatraceService()
+        observability_service = ObservabilityService()
+        
+        jobs = []
+        for technology in TechnologyDashboard.objects.filter(is_active=True).values_list('technology', flat=True):
+            for time_range in time_ranges:
+                jobs.append((dynatrace_service.get_technology_metrics, (technology, time_range, True)))
+        
+        for time_range in time_ranges:
+            jobs.append((observability_service.get_unified_dashboard_summary, (time_range, True)))
+        
+        # Son 24 saatte log üreten uygulamaların sağlık skorları
+        applications = ObservabilityApplication.objects.filter(
+            last_seen__gte=timezone.now() - timedelta(hours=24)
+        ).order_by('-last_seen').values_list('name', flat=True)[
+            :getattr(settings, 'PERFORMANCE_PREWARM_MAX_APPLICATIONS', 50)
+        ]
+        for application_name in applications:
+            jobs.append((observability_service.get_application_health_score, (application_name, '24h', True)))
+        
+        # Web worker'ları aç bırakmamak için ayrı ve sınırlı eşzamanlılık
+        refreshed = 0
+        failed = 0
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PERFORMANCE_PREWARM_CONCURRENCY', 2)
+        ) as executor:
+            futures = [executor.submit(func, *args) for func, args in jobs]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                    refreshed += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Prewarm job failed: {str(e)}")
+        
+        logger.info(f"Dashboard prewarm completed: {refreshed} refreshed, {failed} failed")
+        return {
+            'status': 'success',
+            'refreshed': refreshed,
+            'failed': failed,
+            'timestamp': timezone.now().isoformat()
+        }
+    
+    finally:
+        cache.delete(lock_key)
@@ -12,6 +12,7 @@ urlpatterns = [
     
     # API endpoints
     path('api/technology/<str:technology>/metrics/', views.technology_metrics_api, name='technology_metrics_api'),
+    path('api/technology/<str:technology>/stream/', views.technology_stream, name='technology_stream'),
     path('api/metrics/<int:pk>/data/', views.metric_data_api, name='metric_data_api'),
     path('api/observability/logs/', views.observability_logs_api, name='observability_logs_api'),
     path('api/observability/summary/', views.observability_summary_api, name='observability_summary_api'),
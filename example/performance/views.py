@@ -2,17 +2,19 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.core.paginator import Paginator
 from django.db.models import Q, Avg, Max, Min
 from django.utils import timezone
 from datetime import timedelta
 from .models import (
     TechnologyDashboard, MetricDefinition, MetricData, 
-    Alert, MetricSource, ObservabilityLog
+    Alert, MetricSource, ObservabilityApplication
 )
 from .services.dynatrace import DynatraceService
 from .services.observability_service import ObservabilityService
+from .services.event_stream import sse_stream
+from .services.wire_format import wants_compact, compact_response
 import json
 
 class PerformanceDashboardView(LoginRequiredMixin, TemplateView):
@@ -98,22 +100,25 @@ def metric_detail(request, pk):
     
     # Son 24 saatlik veri
     last_24h = timezone.now() - timedelta(hours=24)
-    recent_data = MetricData.objects.filter(
-        metric=metric,
+    window = MetricData.objects.filter(
+        series__metric=metric,
         timestamp__gte=last_24h
-    ).order_by('-timestamp')[:100]
+    )
+    recent_data = window.order_by('-timestamp')[:100]
     
-    # İstatistikler
-    if recent_data:
-        values = [data.value for data in recent_data]
-        stats = {
-            'current': values[0] if values else 0,
-            'average': sum(values) / len(values),
-            'maximum': max(values),
-            'minimum': min(values),
-        }
-    else:
-        stats = {'current': 0, 'average': 0, 'maximum': 0, 'minimum': 0}
+    # İstatistikler (tek SQL aggregate sorgusu)
+    aggregates = window.aggregate(
+        average=Avg('value'),
+        maximum=Max('value'),
+        minimum=Min('value'),
+    )
+    latest = recent_data.values_list('value', flat=True).first()
+    stats = {
+        'current': latest or 0,
+        'average': aggregates['average'] or 0,
+        'maximum': aggregates['maximum'] or 0,
+        'minimum': aggregates['minimum'] or 0,
+    }
     
     # İlgili uyarılar
     alerts = Alert.objects.filter(metric=metric).order_by('-triggered_at')[:10]
@@ -141,10 +146,10 @@ class ObservabilityDashboardView(LoginRequiredMixin, TemplateView):
             ('7d', 'Son 7 Gün'),
         ]
         
-        # Uygulama listesi (filtreleme için)
-        context['applications'] = ObservabilityLog.objects.values_list(
-            'application_name', flat=True
-        ).distinct().order_by('application_name')
+        # Uygulama listesi (filtreleme için, ingest sırasında güncellenir)
+        context['applications'] = ObservabilityApplication.objects.values_list(
+            'name', flat=True
+        ).order_by('name')
         
         # Platform durumları
         context['platforms'] = [
@@ -165,18 +170,42 @@ def technology_metrics_api(request, technology):
         dynatrace_service = DynatraceService()
         metrics_data = dynatrace_service.get_technology_metrics(technology, time_range)
         
-        return JsonResponse({
+        payload = {
             'success': True,
             'data': metrics_data,
             'technology': technology,
             'time_range': time_range
-        })
+        }
+        
+        if wants_compact(request):
+            return compact_response(payload)
+        return JsonResponse(payload)
     except Exception as e:
         return JsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
 
+@login_required
+def technology_stream(request, technology):
+    """Teknoloji dashboard'u için canlı metrik ve uyarı akışı (Server-Sent Events)"""
+    get_object_or_404(TechnologyDashboard, technology=technology, is_active=True)
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    if last_event_id is not None:
+        try:
+            last_event_id = max(int(last_event_id), 0)
+        except ValueError:
+            last_event_id = 0
+    
+    response = StreamingHttpResponse(
+        sse_stream(technology, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @login_required
 def metric_data_api(request, pk):
     """Metrik verisi API"""
@@ -198,7 +227,7 @@ def metric_data_api(request, pk):
         else:
             metric_data = {'values': [], 'timestamps': [], 'current': 0, 'average': 0}
         
-        return JsonResponse({
+        payload = {
             'success': True,
             'data': metric_data,
             'metric': {
@@ -206,7 +235,11 @@ def metric_data_api(request, pk):
                 'unit': metric.unit,
                 'chart_type': metric.chart_type
             }
-        })
+        }
+        
+        if wants_compact(request):
+            return compact_response(payload)
+        return JsonResponse(payload)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -218,10 +251,26 @@ def observability_logs_api(request):
     """Birleşik observability logları API"""
     application_name = request.GET.get('application')
     time_range = request.GET.get('range', '24h')
+    limit = request.GET.get('limit')
+    
+    if limit:
+        try:
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'limit pozitif bir tam sayı olmalı'
+            }, status=400)
+    else:
+        limit = None
     
     try:
         observability_service = ObservabilityService()
-        logs_data = observability_service.get_unified_error_logs(application_name, time_range)
+        logs_data = observability_service.get_unified_error_logs(
+            application_name, time_range, limit
+        )
         
         return JsonResponse({
             'success': True,